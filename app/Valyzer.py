@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 import streamlit as st
 from src.config.config import IMG_PATH
+from src.services.resources import warmup
 
 # Set Streamlit page configuration
 st.set_page_config(
@@ -26,3 +27,6 @@ st.markdown(
 
 
 st.image(f"{IMG_PATH}Valyzer_Logo1.3.png", width=600)
+
+# Load airports, holidays, the Amadeus token and rates in the background while the user picks a page
+warmup()
@@ -8,18 +8,43 @@ import streamlit as st
 import pandas as pd
 from datetime import date, timedelta
 import streamlit_toggle as tog
-from src.services.travel_service import TravelService
-from src.utils.country_utils import extract_city_name, get_holidays, extract_iata
-from models.travel_forecaster import TravelForecaster
+from src.services.resources import get_travel_service, warmup
+from src.utils.country_utils import extract_city_name
+from models.forecaster_cache import forecaster_cache
 
 
 # Set Streamlit page configuration
 st.set_page_config(layout="wide")
 
 
-# Retrieve airport data from service layer
-service = TravelService()
-airports = service.get_airports()
+# Shared by every session and rerun of this process; warmup only does work on the first run
+service = get_travel_service()
+warmup()
+
+# Only the airports matching the typed text are sent to the browser, not the whole catalog
+AIRPORT_SEARCH_LIMIT = 50
+
+
+def airport_selectbox(label, query_key, select_key, placeholder_text, exclude=None, help=None):
+    query = st.text_input(
+        f"Search {label.lower()} airport",
+        key=query_key,
+        placeholder="City, airport name or IATA code (e.g. IST)"
+    )
+    matches = service.search_airports(query, k=AIRPORT_SEARCH_LIMIT) if query else []
+
+    # Keep the current selection available while the user types a new search
+    current = st.session_state.get(select_key)
+    if current and current != placeholder_text and current not in matches:
+        matches = [current] + matches
+
+    return st.selectbox(
+        label,
+        options=[placeholder_text] + [a for a in matches if a != exclude],
+        index=0,
+        key=select_key,
+        help=help
+    )
 
 # Streamlit UI
 st.title("✈️ Travel Price Forecast")
@@ -29,15 +54,14 @@ col_left, col_right = st.columns([1, 1])
 
 with col_left:
     placeholder_text = "Please select an airport"
-    airport_options = [placeholder_text] + airports
 
-    # Origin selectbox
-    origin = st.selectbox(
+    # Origin search + selectbox
+    origin = airport_selectbox(
         "Origin",
-        options=airport_options,
-        index=0,
-        key="travel_origin",
-        help="Select your departure airport. The list is not exhaustive, but includes major airports worldwide.\n\n**Tip:** You can type airport codes in Uppercase (e.g. `SAW`), and we'll match them."
+        query_key="travel_origin_query",
+        select_key="travel_origin",
+        placeholder_text=placeholder_text,
+        help="Select your departure airport. The list is not exhaustive, but includes major airports worldwide.\n\n**Tip:** You can search by city, airport name or airport code (e.g. `SAW`), and we'll match them."
     )
 
     # Check if origin is selected with session_state
@@ -51,13 +75,13 @@ with col_left:
 
     # Destination selectbox only show if origin is selected
     if st.session_state.origin_selected:
-        destination_options = [placeholder_text] + [a for a in airports if a != origin]
-        destination = st.selectbox(
+        destination = airport_selectbox(
             "Destination",
-            options=destination_options,
-            index=0,
-            key="travel_destination",
-            help="Select your arrival airport. The list is not exhaustive, but includes major airports worldwide.\n\n**Tip:** You can type airport codes in Uppercase (e.g. `IST`), and we'll match them."
+            query_key="travel_destination_query",
+            select_key="travel_destination",
+            placeholder_text=placeholder_text,
+            exclude=origin,
+            help="Select your arrival airport. The list is not exhaustive, but includes major airports worldwide.\n\n**Tip:** You can search by city, airport name or airport code (e.g. `IST`), and we'll match them."
         )
     else:
         st.info("Please select an origin airport before choosing a destination.")
@@ -169,24 +193,91 @@ def check_and_warn(df, label=""):
     return df if isinstance(df, pd.DataFrame) else pd.DataFrame()
 
 
-# Caching the travel data retrieval function to optimize performance
-# This will cache the results for 45 minutes (2700 seconds)
-@st.cache_data(ttl=2700, show_spinner=False)
-def get_cached_travel_data(origin, destination, travel_date, classInfo, numOfAdults, selected_currency,):
-    return service.get_travel_data(
+# Formats the typed flight data for display (prices, dates and times are kept numeric until here)
+def format_flight_table(df):
+    if df.empty:
+        return df
+    table = pd.DataFrame({
+        "date": df["date"].dt.strftime("%Y-%m-%d"),
+        "origin": df["origin"],
+        "destination": df["destination"],
+        "price": df["price"].map("{:.2f}".format) + " " + df["currency"].astype(str),
+        "flight_type": df["flight_type"],
+        "route": df["route"],
+        "duration": df["duration"].astype(str).str.split(" days ").str[-1],
+        "departure_time": df["departure_at"].dt.strftime("%H:%M"),
+        "arrival_time": df["arrival_at"].dt.strftime("%H:%M"),
+        "carriers": df["carriers"],
+        "flight_numbers": df["flight_numbers"],
+    })
+    multiple_adults = df["adults"] > 1
+    table.loc[multiple_adults, "price"] += " - for [" + df.loc[multiple_adults, "adults"].astype(str) + " Adults]"
+    return table
+
+
+# Fetches the flights and every side lookup of the trip in parallel. Flight legs stream date by date,
+# so the progress bar and a live preview of the prices update as dates arrive.
+# Repeated and overlapping searches are served from the service's response caches.
+def fetch_trip_bundle(origin, destination, travel_date, return_date, classInfo, numOfAdults, selected_currency,
+                      progress_bar, preview):
+    leg_labels = {"departure": "Departure", "return": "Return"}
+    chunks = {leg: [] for leg in leg_labels}
+    leg_progress = {}
+    done = set()
+    component_count = 7 if return_date else 6
+
+    def on_progress(component, event):
+        if event.get("done"):
+            done.add(component)
+            leg_progress.pop(component, None)
+        else:
+            leg_progress[component] = event["completed"] / event["total"]
+            if not event["data"].empty:
+                chunks[component].append(event["data"])
+                partial = pd.concat(chunks[component], ignore_index=True).sort_values("date", kind="stable", ignore_index=True)
+                with preview.container():
+                    st.caption(f"{leg_labels[component]} prices found so far")
+                    st.line_chart(partial.groupby("date")["price"].min())
+                    st.dataframe(format_flight_table(partial))
+
+        progress = int(100 * (len(done) + sum(leg_progress.values())) / component_count)
+        fetching = ", ".join(f"{leg_labels[leg]} {int(100 * fraction)}%" for leg, fraction in leg_progress.items())
+        progress_bar.progress(min(progress, 100), text=f"Fetched {len(done)}/{component_count} trip details" + (f" ({fetching})" if fetching else ""))
+
+    return service.get_trip_bundle(
         origin=origin,
         destination=destination,
         travel_date=travel_date,
         classInfo=classInfo,
         numOfAdults=numOfAdults,
-        selected_currency=selected_currency
+        selected_currency=selected_currency,
+        return_date=return_date,
+        on_progress=on_progress
     )
 
+
+# Current trip selection; lookups fetched with the flights are reused while it stays the same
+def current_trip_key():
+    return (
+        st.session_state.get("travel_origin"),
+        st.session_state.get("travel_destination"),
+        travel_date,
+        return_date if is_round_trip else None
+    )
+
+
+# Returns a component of the last trip bundle if it belongs to the current trip, otherwise fetches it
+def from_trip_bundle(component, fetch):
+    bundle = st.session_state.get("trip_bundle")
+    if bundle and bundle["trip_key"] == current_trip_key() and component in bundle["values"]:
+        return bundle["values"][component]
+    return fetch()
+
 # Caching the activities retrieval function to optimize performance
 # This will cache the results for 15 minutes (900 seconds)
 @st.cache_data(ttl=900, show_spinner=False)
-def get_cached_activities(city_name):
-    return service.get_destination_activities(city_name)
+def get_cached_activities(destination):
+    return service.get_destination_activities(destination)
 
 
 # Caching the hotels retrieval function to optimize performance
@@ -213,6 +304,7 @@ if forecast_clicked:
     else:
         with st.spinner("Loading travel prices... Please wait"):
             progress_bar = st.progress(0, text="Fetching data...")
+            preview = st.empty()
             travel_class_api_value = travel_class_map[selected_class_display]
             travel_date_str = travel_date.strftime("%Y-%m-%d")
             return_date_str = return_date.strftime("%Y-%m-%d") if is_round_trip else None
@@ -220,49 +312,23 @@ if forecast_clicked:
             st.session_state["return_date_str"] = return_date_str
 
             try:
-                df_departure = get_cached_travel_data(
-                    origin=origin,
-                    destination=destination,
-                    travel_date=travel_date_str,
-                    classInfo=travel_class_api_value,
-                    numOfAdults=num_adults,
-                    selected_currency=selected_currency
+                bundle = fetch_trip_bundle(
+                    origin, destination, travel_date_str, return_date_str, travel_class_api_value, num_adults, selected_currency,
+                    progress_bar, preview
                 )
-                progress_bar.progress(50, text="Fetching return data..." if is_round_trip else "Processing...")
-                df_return = None
-                if is_round_trip:
-                    df_return = get_cached_travel_data(
-                        origin=destination,
-                        destination=origin,
-                        travel_date=return_date_str,
-                        classInfo=travel_class_api_value,
-                        numOfAdults=num_adults,
-                        selected_currency=selected_currency
-                    )
+                # Failed components keep their error dicts, so each section shows its own warning
+                values = {**bundle["errors"], **bundle["results"]}
+                st.session_state["trip_bundle"] = {"trip_key": current_trip_key(), "values": values}
+                df_departure = values["departure"]
+                df_return = values.get("return")
                 progress_bar.progress(100, text="Done!")
-                # --- TEST PRINTS ---
-                print("DEPARTURE FLIGHT DATA HEAD:")
-                print(df_departure.head() if isinstance(df_departure, pd.DataFrame) else df_departure)
-                print("RETURN FLIGHT DATA HEAD:")
-                print(df_return.head() if isinstance(df_return, pd.DataFrame) else df_return)
-                print("TRAVEL DATE HEAD:")
-                print(travel_date)
-                print("RETURN DATE HEAD:")
-                print(return_date)
-                print("ORIGIN WEATHER HEAD:")
-                print(service.get_weather(extract_city_name(origin)))
-                print("DESTINATION WEATHER HEAD:")
-                print(service.get_weather(extract_city_name(destination)))
-                # Tatil günlerinin head'i
-                destination_iata_code = extract_iata(destination)
-                holidays = get_holidays(travel_date, destination_iata_code, travel_date.year, return_date if is_round_trip else None)
-                print("HOLIDAYS HEAD:")
-                print(holidays[:5] if isinstance(holidays, list) else holidays)
+                preview.empty()
             except Exception as e:
                 st.error(f"⚠️ Error fetching flight data: {e}")
                 df_departure = pd.DataFrame()
                 df_return = pd.DataFrame()
                 progress_bar.empty()
+                preview.empty()
 
             st.session_state["df_departure"] = check_and_warn(df_departure, "Departure - ")
             st.session_state["df_return"] = check_and_warn(df_return, "Return - ") if is_round_trip else pd.DataFrame()
@@ -296,16 +362,21 @@ if not df_departure.empty:
     # 💡 Prophet modeli eğit & öneriyi üret
     try:
         with st.spinner("🧠 Training ML model and analyzing prices..."):
-            model = TravelForecaster()
-
             # 🔵 Get dates from Session
             travel_date_str = st.session_state.get("travel_date_str")
             return_date_str = st.session_state.get("return_date_str")
             forecast_target_date = travel_date_str if st.session_state["trip_option_graph"] == "Departure" else return_date_str
             current_df = df_departure if st.session_state["trip_option_graph"] == "Departure" else df_return
 
-            df_clean = model.preprocess(current_df, forecast_target_date)
-            model.train(df_clean)
+            # Reruns with the same route and data load the fitted model instead of retraining it
+            model = forecaster_cache.get_or_train(
+                current_df,
+                forecast_target_date,
+                origin=current_df["origin"].iloc[0],
+                destination=current_df["destination"].iloc[0],
+                travel_class=travel_class_map[selected_class_display],
+                adults=num_adults
+            )
             forecast_df = model.forecast(forecast_target_date)
 
             days_before, best_price = model.recommend_buy_day()
@@ -377,11 +448,11 @@ if not df_departure.empty:
 
     with col1:
         st.subheader("📊 Price Table")
-        st.dataframe(current_df)
+        st.dataframe(format_flight_table(current_df))
 
     with col2:
         st.subheader("📈 Price Trend")
-        st.line_chart(current_df.set_index("date")["price"])
+        st.line_chart(current_df.groupby("date")["price"].min())
         st.markdown("**Note:** The prices are indicative and may vary based on real-time availability and booking conditions.")
         st.markdown("**Note:** <span style='color:red'>There may be minor changes in currency exchanges depending on the provider's data!</span>", unsafe_allow_html=True)
 
@@ -392,8 +463,8 @@ if not df_departure.empty:
     if 'destination' in locals() and destination and destination != placeholder_text:
         selected_city = extract_city_name(destination)
         if selected_city:
-            activities = get_cached_activities(selected_city)
-            hotels = get_cached_hotels(destination)
+            activities = from_trip_bundle("activities", lambda: get_cached_activities(destination))
+            hotels = from_trip_bundle("hotels", lambda: get_cached_hotels(destination))
 
             col1, col2 = st.columns([1, 1], gap="large")
 
@@ -433,10 +504,12 @@ if not df_departure.empty:
                 if not hotels or not isinstance(hotels, list):
                     st.info("❗ No hotel data found.")
                 else:
-                    hotels = sorted(hotels, key=lambda h: h.get("overallRating", 0) or 0, reverse=True)[:10]
+                    # Rating data comes from the hotel-sentiments lookup, attached under "ratings"
+                    hotels = sorted(hotels, key=lambda h: (h.get("ratings") or {}).get("overallRating", 0) or 0, reverse=True)[:10]
 
                     for hotel in hotels:
-                        rating = hotel.get("overallRating")
+                        ratings = hotel.get("ratings") or {}
+                        rating = ratings.get("overallRating")
                         if rating is not None:
                             stars = math.ceil((rating / 100) * 5)
                             yellow_star = "⭐"
@@ -459,7 +532,7 @@ if not df_departure.empty:
                             '>
                                 <h4 style='margin-bottom: 6px; color: #333;'>{hotel.get("name", "Unnamed Hotel")}</h4>
                                 <p style='margin: 0 0 4px 0; font-size: 15px; color: #555;'>Overall Rating: {rating_text}</p>
-                                <p style='margin: 0 0 4px 0; font-size: 14px; color: #777;'>Reviews: {hotel.get("numberOfReviews", "N/A")} | Ratings: {hotel.get("numberOfRatings", "N/A")}</p>
+                                <p style='margin: 0 0 4px 0; font-size: 14px; color: #777;'>Reviews: {ratings.get("numberOfReviews", "N/A")} | Ratings: {ratings.get("numberOfRatings", "N/A")}</p>
                                 {star_line}
                             </div>
                         """, unsafe_allow_html=True)
@@ -471,12 +544,7 @@ if not df_departure.empty:
 # Streamlit sidebar for weather information
 
 
-# Caching for optimized weather data retrieval
-@st.cache_data(ttl=900, show_spinner=False)  # 15 minute cache
-def get_cached_weather(city_name):
-    return service.get_weather(city_name)
-
-
+# Weather is cached per city by the service and shared by every session
 
 
 # Function to render weather card
@@ -537,7 +605,7 @@ with st.sidebar:
         render_weather_card(None, "Origin", is_placeholder=True)
     else:
         origin = st.session_state.travel_origin
-        origin_weather = get_cached_weather(extract_city_name(origin))
+        origin_weather = from_trip_bundle("origin_weather", lambda: service.get_weather(origin))
         render_weather_card(origin_weather, extract_city_name(origin))
 
     # Destination hava durumu
@@ -545,7 +613,7 @@ with st.sidebar:
         render_weather_card(None, "Destination", is_placeholder=True)
     else:
         destination = st.session_state.travel_destination
-        destination_weather = get_cached_weather(extract_city_name(destination))
+        destination_weather = from_trip_bundle("destination_weather", lambda: service.get_weather(destination))
         render_weather_card(destination_weather, extract_city_name(destination))
 
 
@@ -557,9 +625,11 @@ if "travel_destination" in st.session_state and st.session_state.travel_destinat
     destination = st.session_state.travel_destination
     city_name = extract_city_name(destination)
     if city_name:
-        destination_iata_code = extract_iata(destination)
-        holidays = get_holidays(travel_date, destination_iata_code, travel_date.year, return_date if is_round_trip else None)
-        if holidays:
+        holidays = from_trip_bundle(
+            "holidays",
+            lambda: service.get_holidays(destination, travel_date, return_date if is_round_trip else None)
+        )
+        if holidays and isinstance(holidays, list):
             st.sidebar.markdown(f"**Holidays in {city_name}:**")
             for date, name in holidays:
                 st.sidebar.markdown(f"- {date}: {name}")
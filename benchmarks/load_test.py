@@ -0,0 +1,334 @@
+"""
+Load test: N concurrent sessions pressing "Forecast Travel Prices" against a local Amadeus stand-in.
+
+Every session does what the Travel page does on a click: the trip bundle (flight window, weather,
+holidays, activities, hotels) through the process-wide TravelService, then training (or loading)
+the forecaster and forecasting the target date. Sessions share the process like Streamlit
+sessions do, so per-process caches, the token manager and the request scheduler all interact.
+
+The stand-in is benchmarks/stub_server.py with the Amadeus test environment limits enforced:
+10 requests per second, one per 100 ms, 429 beyond that. Issued tokens can be made short-lived
+to exercise refreshes under load.
+
+With --mode page each session drives app/pages/2_Travel.py through Streamlit's AppTest instead,
+including script reruns and st.cache_data.
+
+Usage:
+    python benchmarks/load_test.py [--sessions 50] [--routes 5] [--rounds 2] [--mode service|page]
+                                   [--latency-ms 150] [--jitter-ms 50] [--rate-limit 10] [--burst 1]
+                                   [--retry-after SECONDS] [--token-ttl 1799] [--ramp-seconds 0]
+                                   [--output load.json]
+
+Prints a JSON report per round: session latency percentiles, per-component timings, upstream calls
+by endpoint and status, scheduler throttling, token refreshes and cache hit ratios.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from datetime import date, timedelta
+
+from stub_server import start_stub
+from travel_benchmark import ROOT, commit_hash, configure_environment
+
+# Popular routes the sessions pick from, in order
+ROUTE_POOL = [
+    ("IST", "LHR"), ("SAW", "AMS"), ("IST", "CDG"), ("ESB", "FRA"), ("ADB", "MUC"),
+    ("AYT", "BER"), ("IST", "FCO"), ("IST", "MAD"), ("SAW", "BCN"), ("IST", "JFK"),
+    ("IST", "DXB"), ("ESB", "LHR"), ("IST", "VIE"), ("IST", "ZRH"), ("ADB", "AMS"),
+]
+
+
+def percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    if len(values) == 1:
+        cuts = values * 99
+    else:
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 4),
+        "p50": round(cuts[49], 4),
+        "p95": round(cuts[94], 4),
+        "p99": round(cuts[98], 4),
+        "max": round(values[-1], 4),
+    }
+
+
+def delta(before, after):
+    """
+    Difference of two (nested) counter dicts, for stats the app keeps per process.
+    """
+    if isinstance(after, dict):
+        return {key: delta((before or {}).get(key), value) for key, value in after.items()}
+    if isinstance(after, (int, float)) and not isinstance(after, bool) and isinstance(before, (int, float)):
+        return round(after - before, 4)
+    return after
+
+
+def hit_ratios(stats):
+    for counters in stats.values():
+        lookups = counters.get("hits", 0) + counters.get("misses", 0)
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def plan_sessions(sessions, routes, dates, days_ahead, seed=7):
+    """
+    Deterministic (origin, destination, travel_date) per session: routes are spread round robin,
+    dates drawn from a few departure days, so sessions overlap the way real traffic does.
+    """
+    rng = random.Random(seed)
+    pool = ROUTE_POOL[:max(1, min(routes, len(ROUTE_POOL)))]
+    start = date.today() + timedelta(days=days_ahead)
+    return [(*pool[i % len(pool)], (start + timedelta(days=rng.randrange(dates))).isoformat()) for i in range(sessions)]
+
+
+class ServiceSession:
+    """
+    One user clicking "Forecast Travel Prices", calling the services like the page does.
+    """
+
+    def __init__(self, origin, destination, travel_date, currency):
+        from src.services.airport_registry import get_airport_registry
+        registry = get_airport_registry()
+        self.origin = registry.get(origin)["display_name"]
+        self.destination = registry.get(destination)["display_name"]
+        self.travel_date = travel_date
+        self.currency = currency
+
+    def prepare(self):
+        pass
+
+    def click(self):
+        from models.forecaster_cache import forecaster_cache
+        from src.services.resources import get_travel_service
+
+        service = get_travel_service()
+        bundle = service.get_trip_bundle(self.origin, self.destination, self.travel_date, "ECONOMY", 1, self.currency)
+
+        departure = bundle["results"].get("departure")
+        started = time.perf_counter()
+        if departure is not None and not departure.empty:
+            model = forecaster_cache.get_or_train(
+                departure, self.travel_date,
+                origin=departure["origin"].iloc[0],
+                destination=departure["destination"].iloc[0],
+                travel_class="ECONOMY",
+                adults=1
+            )
+            model.forecast(self.travel_date)
+            model.recommend_buy_day()
+        timings = {**bundle["timings"], "forecast": time.perf_counter() - started}
+        return timings, bundle["errors"]
+
+
+class PageSession:
+    """
+    One user on the Travel page, driven through Streamlit's AppTest.
+    """
+
+    def __init__(self, origin, destination, travel_date, currency):
+        self.origin = origin
+        self.destination = destination
+        self.travel_date = date.fromisoformat(travel_date)
+        self.currency = currency
+        self.app = None
+
+    @staticmethod
+    def _select_airport(app, kind, iata):
+        app.text_input(key=f"travel_{kind}_query").input(iata).run()
+        selectbox = app.selectbox(key=f"travel_{kind}")
+        option = next(option for option in selectbox.options if option.endswith(f"({iata})"))
+        selectbox.select(option).run()
+
+    def prepare(self):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(os.path.join(ROOT, "app", "pages", "2_Travel.py"), default_timeout=300)
+        self.app.run()
+        self._select_airport(self.app, "origin", self.origin)
+        self._select_airport(self.app, "destination", self.destination)
+        self.app.date_input[0].set_value(self.travel_date).run()
+
+    def click(self):
+        self.app.button[0].click().run()
+        errors = {f"exception {i}": {"error": str(e.value), "status_code": 500} for i, e in enumerate(self.app.exception)}
+        bundle = self.app.session_state["trip_bundle"] if "trip_bundle" in self.app.session_state else {"values": {}}
+        for component, value in bundle["values"].items():
+            if isinstance(value, dict) and "error" in value:
+                errors[component] = value
+        return {}, errors
+
+
+def run_round(sessions, ramp_seconds):
+    """
+    Prepares every session, then releases them together (or spread over ramp_seconds).
+    Returns one {"seconds", "timings", "errors"} per session.
+    """
+    for session in sessions:
+        session.prepare()
+
+    results = [None] * len(sessions)
+    barrier = threading.Barrier(len(sessions))
+
+    def worker(index, session):
+        barrier.wait()
+        if ramp_seconds:
+            time.sleep(ramp_seconds * index / len(sessions))
+        started = time.perf_counter()
+        try:
+            timings, errors = session.click()
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            timings, errors = {}, {"session": {"error": str(e), "status_code": 500}}
+        results[index] = {"seconds": time.perf_counter() - started, "timings": timings, "errors": errors}
+
+    threads = [threading.Thread(target=worker, args=(i, s), name=f"session-{i}") for i, s in enumerate(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def snapshot():
+    from models.forecaster_cache import forecaster_cache
+    from src.api.response_cache import response_cache
+    from src.api.travel_scraper import offer_columns_cache
+    from src.services.resources import get_travel_service
+
+    service = get_travel_service()
+    return {
+        "scheduler": service.get_quota_stats(),
+        "token_refreshes": service.scraper.token_manager.refresh_count,
+        "caches": {
+            "response_cache": response_cache.stats(),
+            "offer_columns_cache": offer_columns_cache.stats(),
+            "forecaster_cache": dict(forecaster_cache.stats),
+        },
+    }
+
+
+def summarize_round(results, server, before, after, wall_seconds):
+    component_seconds = {}
+    errors = {}
+    for result in results:
+        for component, seconds in result["timings"].items():
+            component_seconds.setdefault(component, []).append(seconds)
+        for component, error in result["errors"].items():
+            key = f"{component} {error.get('status_code')}"
+            errors[key] = errors.get(key, 0) + 1
+
+    stats = delta(before, after)
+    caches = stats["caches"]
+    for name in ("response_cache", "offer_columns_cache"):
+        caches[name] = hit_ratios({endpoint: counters for endpoint, counters in caches[name].items() if "hits" in counters})
+    forecaster = caches["forecaster_cache"]
+    lookups = forecaster["memory_hits"] + forecaster["disk_hits"] + forecaster["misses"]
+    forecaster["hit_ratio"] = round((lookups - forecaster["misses"]) / lookups, 4) if lookups else None
+
+    scheduler = {
+        family: {key: counters[key] for key in ("requests", "throttled", "retries", "wait_seconds")}
+        for family, counters in stats["scheduler"].items() if counters["requests"]
+    }
+
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "sessions_failed": sum(1 for result in results if result["errors"]),
+        "latency": percentiles([result["seconds"] for result in results]),
+        "components": {component: percentiles(seconds) for component, seconds in component_seconds.items()},
+        "errors": errors,
+        "upstream_calls": dict(server.calls),
+        # Fewer distinct searches than flight-offers calls means sessions fetched the same date twice
+        "distinct_flight_searches": len(server.flight_searches),
+        "upstream_statuses": {endpoint: dict(statuses) for endpoint, statuses in server.statuses.items()},
+        "scheduler": scheduler,
+        "token_refreshes": stats["token_refreshes"],
+        "caches": caches,
+    }
+
+
+def run(sessions=50, routes=5, dates=3, rounds=2, mode="service", latency_ms=150.0, jitter_ms=50.0,
+        rate_limit=10.0, burst=1, retry_after=None, token_ttl=1799, ramp_seconds=0.0, currency="TRY", days_ahead=30):
+    server = start_stub(latency_ms=latency_ms, jitter_ms=jitter_ms, rate_limit=rate_limit, burst=burst,
+                        retry_after=retry_after, token_ttl=token_ttl)
+    configure_environment(server.base_url)
+    try:
+        from models.forecaster_cache import forecaster_cache
+        from src.services.resources import get_travel_service
+
+        # Fitted models go to a scratch directory instead of models/cache
+        forecaster_cache.cache_dir = tempfile.mkdtemp(prefix="valyzer-load-")
+        get_travel_service()
+
+        session_class = PageSession if mode == "page" else ServiceSession
+        plan = plan_sessions(sessions, routes, dates, days_ahead)
+        report = {
+            "commit": commit_hash(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "mode": mode, "sessions": sessions, "routes": routes, "dates": dates, "rounds": rounds,
+                "latency_ms": latency_ms, "jitter_ms": jitter_ms, "rate_limit": rate_limit, "burst": burst,
+                "retry_after": retry_after, "token_ttl": token_ttl, "ramp_seconds": ramp_seconds, "currency": currency,
+            },
+            "rounds": [],
+        }
+
+        # The first round starts from empty caches, later ones repeat the same searches
+        for _ in range(rounds):
+            round_sessions = [session_class(*trip, currency) for trip in plan]
+            server.reset_calls()
+            before = snapshot()
+            started = time.perf_counter()
+            results = run_round(round_sessions, ramp_seconds)
+            wall_seconds = time.perf_counter() - started
+            report["rounds"].append(summarize_round(results, server, before, snapshot(), wall_seconds))
+        return report
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50, help="concurrent sessions per round")
+    parser.add_argument("--routes", type=int, default=5, help=f"distinct routes the sessions search (max {len(ROUTE_POOL)})")
+    parser.add_argument("--dates", type=int, default=3, help="distinct departure dates per route")
+    parser.add_argument("--rounds", type=int, default=2, help="rounds of sessions; caches are kept between rounds")
+    parser.add_argument("--mode", choices=("service", "page"), default="service", help="call the services or drive the Streamlit page")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="latency of every stub response")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="random extra latency, uniform in [0, jitter]")
+    parser.add_argument("--rate-limit", type=float, default=10.0, help="Amadeus requests per second before 429 (0 = unlimited)")
+    parser.add_argument("--burst", type=int, default=1, help="requests allowed at once under the rate limit")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with 429 responses (default: none, like Amadeus)")
+    parser.add_argument("--token-ttl", type=int, default=1799, help="lifetime of issued Amadeus tokens in seconds")
+    parser.add_argument("--ramp-seconds", type=float, default=0.0, help="spread session starts over this many seconds")
+    parser.add_argument("--currency", default="TRY")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    # The app reports progress with print from many threads, some of which (bundle components past
+    # their deadline) outlive the round, so stdout stays silenced until the report is written
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    report = run(args.sessions, args.routes, args.dates, args.rounds, args.mode, args.latency_ms, args.jitter_ms,
+                 args.rate_limit or None, args.burst, args.retry_after, args.token_ttl, args.ramp_seconds, args.currency)
+    text = json.dumps(report, indent=2)
+    print(text, file=stdout)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Cold start benchmark for the Streamlit app.
+
+Every sample runs in a fresh interpreter so already-imported modules don't hide import costs:
+- import time of the project modules the pages are built on
+- time to first render of every page (Streamlit AppTest, no browser or server needed)
+- which heavy dependencies each of them ended up loading
+- duration of the offline boot-time warmup (src/services/resources.py)
+
+Usage:
+    python benchmarks/startup_benchmark.py [--repeat 3] [--output startup.json] [--check]
+
+Prints a JSON report. With --check the exit code is 1 when a page loads a dependency
+that must stay off its import path (see PAGE_FORBIDDEN_MODULES).
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+MODULES = [
+    "src.config.config",
+    "src.utils.country_utils",
+    "src.services.travel_service",
+    "models.forecaster_cache",
+]
+
+PAGES = [
+    "app/Valyzer.py",
+    "app/pages/1_Daily_Essentials.py",
+    "app/pages/2_Travel.py",
+]
+
+HEAVY_MODULES = ["sklearn", "scipy", "pycountry", "holidays", "tensorflow", "prophet", "cmdstanpy"]
+
+# Loaded only by the code paths that need them (training, holiday lookups, snapshot rebuilds)
+PAGE_FORBIDDEN_MODULES = {page: HEAVY_MODULES for page in PAGES}
+
+_HEAVY_CHECK = f"[m for m in {HEAVY_MODULES!r} if m in sys.modules]"
+
+_IMPORT_SAMPLE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "heavy_modules": {heavy}}}))
+"""
+
+_RENDER_SAMPLE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_seconds = time.perf_counter() - start
+start = time.perf_counter()
+at = AppTest.from_file({page!r}, default_timeout=300)
+at.run()
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "streamlit_seconds": streamlit_seconds,
+    "exceptions": [str(e.value) for e in at.exception],
+    "heavy_modules": {heavy},
+}}))
+"""
+
+_WARMUP_SAMPLE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from src.services.resources import warmup, warmup_status
+warmup(network=False, wait=True)
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "steps": warmup_status(), "heavy_modules": {heavy}}}))
+"""
+
+
+def run_sample(code, **env):
+    # Pages start the background warmup; it is measured separately so renders stay comparable
+    env = {**os.environ, "WARMUP_ON_START": "false", **env}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=False, env=env
+    )
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Benchmark sample failed:\n{result.stderr[-2000:]}")
+    return json.loads(lines[-1])
+
+
+def summarize(samples):
+    seconds = [s["seconds"] for s in samples]
+    summary = {
+        "median_seconds": round(statistics.median(seconds), 4),
+        "min_seconds": round(min(seconds), 4),
+        "max_seconds": round(max(seconds), 4),
+        "heavy_modules": sorted({m for s in samples for m in s["heavy_modules"]}),
+    }
+    if "streamlit_seconds" in samples[0]:
+        summary["streamlit_import_seconds"] = round(statistics.median(s["streamlit_seconds"] for s in samples), 4)
+        summary["exceptions"] = sorted({e for s in samples for e in s["exceptions"]})
+    return summary
+
+
+def run(repeat=3):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "imports": {},
+        "first_render": {},
+        "warmup": {},
+        "violations": [],
+    }
+
+    for module in MODULES:
+        code = _IMPORT_SAMPLE.format(root=ROOT, module=module, heavy=_HEAVY_CHECK)
+        report["imports"][module] = summarize([run_sample(code) for _ in range(repeat)])
+
+    for page in PAGES:
+        code = _RENDER_SAMPLE.format(root=ROOT, page=os.path.join(ROOT, page), heavy=_HEAVY_CHECK)
+        summary = report["first_render"][page] = summarize([run_sample(code) for _ in range(repeat)])
+        for module in summary["heavy_modules"]:
+            if module in PAGE_FORBIDDEN_MODULES.get(page, []):
+                report["violations"].append(f"{page} loads {module}")
+        for error in summary["exceptions"]:
+            report["violations"].append(f"{page} raised {error}")
+
+    # Offline part of the boot-time warmup (reference data and holiday tables)
+    code = _WARMUP_SAMPLE.format(root=ROOT, heavy=_HEAVY_CHECK)
+    samples = [run_sample(code, WARMUP_ON_START="true") for _ in range(repeat)]
+    report["warmup"] = summarize(samples)
+    report["warmup"]["steps"] = samples[-1]["steps"]
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="fresh-interpreter samples per measurement")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if there are violations")
+    args = parser.parse_args()
+
+    report = run(args.repeat)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.check and report["violations"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""
+Local stand-in for the Amadeus, Frankfurter and OpenWeatherMap endpoints the app calls.
+
+Serves the fixtures in benchmarks/fixtures/ with a configurable injected latency, so the travel
+pipeline can be benchmarked offline and without spending API quota. The fixtures are hand-written
+from the response shapes in the Amadeus, Frankfurter and OpenWeatherMap documentation, not captured
+from real traffic, so the numbers measure this app's own overhead rather than upstream behaviour. Point the app at
+it through AMADEUS_BASE_URL, FRANKFURTER_BASE_URL and OPENWEATHERMAP_BASE_URL (src/config/config.py).
+
+Flight offers are built from one hand-written IST -> LHR search: the requested route and date are
+written into the itineraries and prices vary deterministically per route and date, so a 15 day
+window gives the forecaster something to fit.
+
+Like the Amadeus test environment it can also enforce a rate limit on the Amadeus endpoints
+(10 transactions per second, one request per 100 ms), answering 429 when it is exceeded, and
+issue tokens that expire so clients have to refresh them (401 for expired or unknown tokens).
+
+Usage:
+    python benchmarks/stub_server.py [--port 8765] [--latency-ms 150] [--jitter-ms 0]
+                                     [--rate-limit 10 --burst 1] [--retry-after 1] [--token-ttl 1799]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Departure date used in the flight offers fixture, rewritten to the requested date
+FIXTURE_DATE = "2030-01-15"
+
+# Endpoints counted against the Amadeus rate limit and checked for a valid token
+AMADEUS_ENDPOINTS = ("flight-offers", "locations", "activities", "hotels", "hotel-sentiments")
+
+TOO_MANY_REQUESTS = {"errors": [{"status": 429, "code": 38194, "title": "Too many requests",
+                                 "detail": "The network rate limit is exceeded, please try again later"}]}
+ACCESS_TOKEN_EXPIRED = {"errors": [{"status": 401, "code": 38192, "title": "Access token expired",
+                                    "detail": "The access token provided in the Authorization header has expired"}]}
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_PATH, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Benchmarks open many connections at once
+    request_queue_size = 128
+
+    def __init__(self, address, latency_ms=0.0, jitter_ms=0.0, rate_limit=None, burst=1, retry_after=None, token_ttl=None):
+        """
+        rate_limit: Amadeus requests per second allowed before answering 429 (None = unlimited),
+            with up to burst requests at once. retry_after is sent with every 429 when given.
+        token_ttl: lifetime in seconds of the issued tokens; when set, Amadeus calls need a
+            token issued by this server that has not expired. None accepts any token.
+        """
+        super().__init__(address, StubHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.burst = max(1, burst)
+        self.retry_after = retry_after
+        self.token_ttl = token_ttl
+        self.fixtures = {
+            name: load_fixture(f"{name}.json")
+            for name in ("amadeus_token", "amadeus_flight_offers", "amadeus_locations", "amadeus_activities",
+                         "amadeus_hotels_by_city", "amadeus_hotel_sentiment", "frankfurter_latest_EUR",
+                         "openweathermap_weather")
+        }
+        self.calls = {}
+        self.statuses = {}
+        self.flight_searches = set()
+        self._calls_lock = threading.Lock()
+        self._random = random.Random(0)
+        self._tokens = {}
+        self._tokens_issued = 0
+        self._allowance = float(self.burst)
+        self._allowance_at = time.monotonic()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, endpoint, status=200):
+        with self._calls_lock:
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+            statuses = self.statuses.setdefault(endpoint, {})
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    def reset_calls(self):
+        with self._calls_lock:
+            self.calls.clear()
+            self.statuses.clear()
+            self.flight_searches.clear()
+
+    def take_rate_slot(self):
+        """
+        Token bucket shared by every Amadeus endpoint. Returns False when the request is over the limit.
+        """
+        if not self.rate_limit:
+            return True
+        with self._calls_lock:
+            now = time.monotonic()
+            self._allowance = min(self.burst, self._allowance + (now - self._allowance_at) * self.rate_limit)
+            self._allowance_at = now
+            if self._allowance < 1:
+                return False
+            self._allowance -= 1
+            return True
+
+    def issue_token(self):
+        with self._calls_lock:
+            self._tokens_issued += 1
+            token = f"stub-token-{self._tokens_issued}"
+            self._tokens[token] = time.monotonic() + self.token_ttl
+        return {**self.fixtures["amadeus_token"], "access_token": token, "expires_in": self.token_ttl}
+
+    def token_valid(self, authorization):
+        if self.token_ttl is None:
+            return True
+        token = (authorization or "").removeprefix("Bearer ").strip()
+        with self._calls_lock:
+            return time.monotonic() < self._tokens.get(token, 0.0)
+
+    def delay(self):
+        latency = self.latency_ms
+        if self.jitter_ms:
+            with self._calls_lock:
+                latency += self._random.uniform(0, self.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    # --- Responses ---
+
+    def flight_offers(self, params):
+        origin = params.get("originLocationCode", "IST")
+        destination = params.get("destinationLocationCode", "LHR")
+        departure_date = params.get("departureDate", FIXTURE_DATE)
+        with self._calls_lock:
+            self.flight_searches.add((origin, destination, departure_date, params.get("travelClass"), params.get("adults")))
+        response = copy.deepcopy(self.fixtures["amadeus_flight_offers"])
+
+        # Weekend departures are dearer, and every (route, date) gets its own stable offset
+        day = date.fromisoformat(departure_date)
+        factor = 1.0 + (0.18 if day.weekday() >= 4 else 0.0)
+        factor += (zlib.crc32(f"{origin}{destination}{departure_date}".encode()) % 400) / 1000
+
+        for offer in response["data"]:
+            for itinerary in offer["itineraries"]:
+                segments = itinerary["segments"]
+                segments[0]["departure"]["iataCode"] = origin
+                segments[-1]["arrival"]["iataCode"] = destination
+                for segment in segments:
+                    for end in ("departure", "arrival"):
+                        segment[end]["at"] = segment[end]["at"].replace(FIXTURE_DATE, departure_date)
+            for price in [offer["price"]] + [traveler["price"] for traveler in offer["travelerPricings"]]:
+                for field in ("total", "base", "grandTotal"):
+                    if field in price:
+                        price[field] = f"{float(price[field]) * factor:.2f}"
+        response["meta"]["count"] = len(response["data"])
+        return response
+
+    def latest_rates(self, params):
+        fixture = self.fixtures["frankfurter_latest_EUR"]
+        base = params.get("from", "EUR").upper()
+        rates = {"EUR": 1.0, **fixture["rates"]}
+        if base not in rates:
+            return None
+        # Rebase the fixture's EUR table
+        return {
+            "amount": 1.0,
+            "base": base,
+            "date": fixture["date"],
+            "rates": {code: round(rate / rates[base], 6) for code, rate in rates.items() if code != base}
+        }
+
+    def hotel_sentiments(self, params):
+        template = self.fixtures["amadeus_hotel_sentiment"]["data"][0]
+        data = []
+        for hotel_id in params.get("hotelIds", "").split(","):
+            if hotel_id:
+                rating = dict(template, hotelId=hotel_id)
+                rating["overallRating"] = 70 + zlib.crc32(hotel_id.encode()) % 25
+                data.append(rating)
+        return {"meta": {"count": len(data)}, "data": data}
+
+    def respond(self, method, path, params):
+        """
+        Returns (endpoint, status, body) for a request.
+        """
+        if method == "POST" and path == "/v1/security/oauth2/token":
+            if not self.take_rate_slot():
+                return "auth", 429, TOO_MANY_REQUESTS
+            return "auth", 200, self.fixtures["amadeus_token"] if self.token_ttl is None else self.issue_token()
+        if method != "GET":
+            return "unknown", 405, {"errors": [{"status": 405, "title": "METHOD NOT ALLOWED"}]}
+        if path == "/v2/shopping/flight-offers":
+            return "flight-offers", 200, self.flight_offers(params)
+        if path == "/v1/reference-data/locations":
+            return "locations", 200, self.fixtures["amadeus_locations"]
+        if path == "/v1/shopping/activities":
+            return "activities", 200, self.fixtures["amadeus_activities"]
+        if path == "/v1/reference-data/locations/hotels/by-city":
+            return "hotels", 200, self.fixtures["amadeus_hotels_by_city"]
+        if path == "/v2/e-reputation/hotel-sentiments":
+            return "hotel-sentiments", 200, self.hotel_sentiments(params)
+        if path == "/latest":
+            rates = self.latest_rates(params)
+            if rates is None:
+                return "frankfurter", 404, {"message": "not found"}
+            return "frankfurter", 200, rates
+        if path == "/data/2.5/weather":
+            return "weather", 200, self.fixtures["openweathermap_weather"]
+        return "unknown", 404, {"errors": [{"status": 404, "title": "RESOURCE NOT FOUND"}]}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self, method):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if method == "POST":
+            # Drain the form body so the keep-alive connection stays usable
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        endpoint, status, body = self.server.respond(method, url.path, params)
+        headers = {}
+        if endpoint in AMADEUS_ENDPOINTS and status == 200:
+            # Limits are checked on arrival, like the real gateway does before doing any work
+            if not self.server.take_rate_slot():
+                status, body = 429, TOO_MANY_REQUESTS
+            elif not self.server.token_valid(self.headers.get("Authorization")):
+                status, body = 401, ACCESS_TOKEN_EXPIRED
+        if status == 429 and self.server.retry_after is not None:
+            headers["Retry-After"] = f"{self.server.retry_after:g}"
+
+        self.server.count(endpoint, status)
+        self.server.delay()
+        self.send_json(status, body, headers)
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub(host="127.0.0.1", port=0, latency_ms=0.0, jitter_ms=0.0, server_class=StubServer, **kwargs):
+    """
+    Starts a stub server in a daemon thread (port 0 picks a free port) and returns it.
+    Stop it with server.shutdown().
+    """
+    server = server_class((host, port), latency_ms=latency_ms, jitter_ms=jitter_ms, **kwargs)
+    threading.Thread(target=server.serve_forever, name="valyzer-stub", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay, uniform in [0, jitter]")
+    parser.add_argument("--rate-limit", type=float, help="Amadeus requests per second before answering 429 (default: unlimited)")
+    parser.add_argument("--burst", type=int, default=1, help="requests allowed at once under --rate-limit")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds sent with 429 responses (default: none)")
+    parser.add_argument("--token-ttl", type=int, help="lifetime of issued tokens in seconds (default: any token is accepted)")
+    args = parser.parse_args()
+
+    server = StubServer((args.host, args.port), latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        rate_limit=args.rate_limit, burst=args.burst, retry_after=args.retry_after, token_ttl=args.token_ttl)
+    print(f"Serving fixtures on {server.base_url} ({args.latency_ms:g} ms latency)")
+    print(f"    AMADEUS_BASE_URL={server.base_url} FRANKFURTER_BASE_URL={server.base_url} OPENWEATHERMAP_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
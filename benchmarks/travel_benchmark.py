@@ -0,0 +1,249 @@
+"""
+Offline benchmark of the travel pipeline.
+
+Serves the Amadeus, Frankfurter and OpenWeatherMap fixtures in benchmarks/fixtures/ (hand-written
+from the documented response shapes, not captured from real traffic) through a local stub server
+(benchmarks/stub_server.py) with an injected per-request latency, and measures:
+- travel_scraper.fetch_travel_data end-to-end: cold (empty caches), cold with sequential
+  searches, and warm (everything cached), with the upstream calls each run made
+- offer parsing throughput (_parse_offers and _build_flights_frame)
+- TravelForecaster preprocess / train / forecast on synthetic fare histories of several sizes
+
+Usage:
+    python benchmarks/travel_benchmark.py [--latency-ms 150] [--repeat 5] [--sizes 15,1000,100000]
+                                          [--output travel.json]
+
+Prints a JSON report (with the commit it ran on) so results can be compared across commits.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from stub_server import FIXTURE_DATE, load_fixture, start_stub
+
+ROUTE = ("Istanbul Airport (IST)", "London Heathrow Airport (LHR)")
+
+
+def configure_environment(base_url):
+    """
+    Points the app at the stub and keeps every cache in memory.
+    Must run before anything from src/ is imported, the config is read at import time.
+    """
+    os.environ.update({
+        "AMADEUS_BASE_URL": base_url,
+        "FRANKFURTER_BASE_URL": base_url,
+        "OPENWEATHERMAP_BASE_URL": base_url,
+        "AMADEUS_API_KEY": "benchmark-key",
+        "AMADEUS_API_SECRET": "benchmark-secret",
+        "AMADEUS_TOKEN_CACHE_FILE": "",
+        "OPENWEATHERMAP_API_KEY": "benchmark-key",
+        "RESPONSE_CACHE_BACKEND": "memory",
+        "RECORD_FARE_HISTORY": "false",
+        "WARMUP_ON_START": "false",
+    })
+
+
+@contextlib.contextmanager
+def quiet():
+    # The pipeline reports progress with print, keep it out of the JSON report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    with quiet():
+        result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def summarize(seconds):
+    return {
+        "median_seconds": round(statistics.median(seconds), 4),
+        "min_seconds": round(min(seconds), 4),
+        "max_seconds": round(max(seconds), 4),
+    }
+
+
+def clear_caches():
+    from src.api.currency_rates import currency_rates
+    from src.api.response_cache import response_cache
+    from src.api.travel_scraper import offer_columns_cache
+    response_cache.clear()
+    offer_columns_cache.clear()
+    currency_rates.clear()
+
+
+def bench_fetch(server, travel_date, repeat, currency):
+    from src.api.travel_scraper import travel_scraper
+    from src.config.config import FETCH_MAX_WORKERS
+
+    scraper = travel_scraper()
+    scraper.get_access_token()
+    origin, destination = ROUTE
+    report = {}
+
+    for name, max_workers, cold in (("cold", FETCH_MAX_WORKERS, True),
+                                    ("cold_sequential", 1, True),
+                                    ("warm", FETCH_MAX_WORKERS, False)):
+        seconds = []
+        calls = {}
+        rows = 0
+        if not cold:
+            clear_caches()
+            with quiet():
+                scraper.fetch_travel_data(origin, destination, travel_date, "ECONOMY", 1, currency, max_workers=max_workers)
+        for _ in range(repeat):
+            if cold:
+                clear_caches()
+            server.reset_calls()
+            elapsed, df = timed(scraper.fetch_travel_data, origin, destination, travel_date, "ECONOMY", 1, currency,
+                                max_workers=max_workers)
+            if isinstance(df, dict):
+                raise RuntimeError(f"fetch_travel_data failed: {df}")
+            seconds.append(elapsed)
+            calls = dict(server.calls)
+            rows = len(df)
+        report[name] = {**summarize(seconds), "max_workers": max_workers, "rows": rows, "upstream_calls": calls}
+    return report
+
+
+def bench_parsing(repeat, currency, dates=15):
+    from src.api.travel_scraper import OFFER_COLUMNS, travel_scraper
+
+    response = load_fixture("amadeus_flight_offers.json")
+    offers = len(response["data"]) * dates
+    scraper = travel_scraper()
+
+    parse_seconds, build_seconds = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        per_date = [travel_scraper._parse_offers(response, FIXTURE_DATE, "IST", "LHR") for _ in range(dates)]
+        parse_seconds.append(time.perf_counter() - start)
+
+        columns = {column: [value for date_columns in per_date for value in date_columns[column]] for column in OFFER_COLUMNS}
+        elapsed, _ = timed(scraper._build_flights_frame, columns, "IST", "LHR", 1, currency)
+        build_seconds.append(elapsed)
+
+    return {
+        "offers": offers,
+        "parse_offers": {**summarize(parse_seconds), "offers_per_second": round(offers / statistics.median(parse_seconds))},
+        "build_flights_frame": {**summarize(build_seconds), "offers_per_second": round(offers / statistics.median(build_seconds))},
+    }
+
+
+def synthetic_history(rows, flight_date, seed=42):
+    """
+    Fare observations for departures around flight_date, observed over the 90 days before
+    each departure, with a weekend premium and prices rising towards departure.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    target = pd.Timestamp(flight_date)
+    departure_offsets = rng.integers(-15, 16, rows)
+    lead_days = rng.integers(0, 91, rows)
+    departures = target + pd.to_timedelta(departure_offsets, unit="D")
+    observed_at = departures - pd.to_timedelta(lead_days, unit="D")
+    prices = 180 + 0.8 * (90 - lead_days) + 35 * (departures.dayofweek >= 4) + rng.normal(0, 12, rows)
+    return pd.DataFrame({
+        "date": departures,
+        "price": prices.round(2),
+        "currency": "EUR",
+        "observed_at": observed_at,
+    })
+
+
+def bench_forecaster(sizes, repeat, flight_date):
+    from models.travel_forecaster import TravelForecaster
+
+    report = {}
+    for rows in sizes:
+        df = synthetic_history(rows, flight_date)
+        preprocess_seconds, train_seconds, forecast_seconds = [], [], []
+        for _ in range(repeat):
+            forecaster = TravelForecaster()
+            elapsed, clean = timed(forecaster.preprocess, df, flight_date)
+            preprocess_seconds.append(elapsed)
+            elapsed, _ = timed(forecaster.train, clean)
+            train_seconds.append(elapsed)
+            elapsed, _ = timed(forecaster.forecast, flight_date)
+            forecast_seconds.append(elapsed)
+        report[str(rows)] = {
+            "training_rows": len(clean),
+            "preprocess": summarize(preprocess_seconds),
+            "train": summarize(train_seconds),
+            "forecast": summarize(forecast_seconds),
+        }
+    return report
+
+
+def commit_hash():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(latency_ms=150.0, repeat=5, sizes=(15, 1000, 100000), currency="TRY", days_ahead=30):
+    server = start_stub(latency_ms=latency_ms)
+    configure_environment(server.base_url)
+    try:
+        from datetime import date, timedelta
+        from src.config.config import FETCH_MAX_WORKERS
+        travel_date = (date.today() + timedelta(days=days_ahead)).isoformat()
+
+        # The forecaster is the slowest to warm up (scikit-learn import), keep that out of the timings
+        bench_forecaster([15], 1, travel_date)
+
+        return {
+            "commit": commit_hash(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {
+                "latency_ms": latency_ms,
+                "repeat": repeat,
+                "currency": currency,
+                "travel_date": travel_date,
+                "fetch_max_workers": FETCH_MAX_WORKERS,
+            },
+            "fetch_travel_data": bench_fetch(server, travel_date, repeat, currency),
+            "offer_parsing": bench_parsing(repeat, currency),
+            "forecaster": bench_forecaster(sizes, repeat, travel_date),
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="latency injected into every stub response")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per measurement")
+    parser.add_argument("--sizes", default="15,1000,100000", help="comma separated forecaster input sizes (rows)")
+    parser.add_argument("--currency", default="TRY", help="currency the flight prices are converted to")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    report = run(args.latency_ms, args.repeat, sizes, args.currency)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
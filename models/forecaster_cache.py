@@ -0,0 +1,158 @@
+# models/forecaster_cache.py
+
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pandas as pd
+
+from models.travel_forecaster import TravelForecaster
+from src.config.config import MODEL_CACHE_PATH, MODEL_CACHE_MAX_MEMORY, MODEL_CACHE_MAX_DISK
+from src.utils.metrics import metrics
+
+
+class ForecasterCache:
+    """
+    Cache of fitted TravelForecaster models, in memory (LRU) and on disk under MODEL_PATH.
+    
+    A model is keyed by route, travel class, number of adults, target flight date, the day
+    it was trained and a fingerprint of the training frame, so identical inputs load the
+    fitted model instead of refitting it on every Streamlit rerun.
+    """
+
+    def __init__(self, cache_dir=MODEL_CACHE_PATH, max_memory_entries=MODEL_CACHE_MAX_MEMORY, max_disk_entries=MODEL_CACHE_MAX_DISK):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """Content hash of a training frame (values and column names)."""
+        digest = hashlib.sha256("|".join(map(str, df.columns)).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    @classmethod
+    def make_key(cls, df, flight_date, origin, destination, travel_class, adults, training_day=None) -> str:
+        training_day = training_day or datetime.today().strftime("%Y-%m-%d")
+        parts = [origin, destination, travel_class, adults, pd.to_datetime(flight_date).strftime("%Y-%m-%d"), training_day, cls.fingerprint(df)]
+        return hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        """
+        Returns a copy of the cached forecaster for a key, or None.
+        Copies share the fitted regressor but keep their own forecast state.
+        """
+        with self._lock:
+            model = self._memory.get(key)
+            if model is not None:
+                self._memory.move_to_end(key)
+                self._count("memory_hits")
+                return copy.copy(model)
+
+        model = self._load(key)
+        with self._lock:
+            if model is None:
+                self._count("misses")
+                return None
+            self._count("disk_hits")
+            self._remember(key, model)
+        return copy.copy(model)
+
+    def _count(self, outcome):
+        # Called with self._lock held
+        self.stats[outcome] += 1
+        metrics.inc("valyzer_cache_operations_total", cache="forecaster", endpoint="model", outcome=outcome)
+
+    def put(self, key, model):
+        with self._lock:
+            self._remember(key, model)
+        self._save(key, model)
+
+    def get_or_train(self, df, flight_date, origin, destination, travel_class, adults):
+        """
+        Returns a fitted forecaster for the training frame, training (and caching) it only on a miss.
+        """
+        key = self.make_key(df, flight_date, origin, destination, travel_class, adults)
+        model = self.get(key)
+        if model is not None:
+            return model
+
+        model = TravelForecaster()
+        model.train(model.preprocess(df, flight_date))
+        self.put(key, model)
+        return copy.copy(model)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _remember(self, key, model):
+        self._memory[key] = model
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    # On-disk store
+    #-------------------------------------------------------------------
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+            os.utime(path)  # mark as recently used for eviction
+            return model
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[Model Cache] Ignoring unreadable model {path}: {e}")
+            return None
+
+    def _save(self, key, model):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+            self._evict_disk()
+        except OSError as e:
+            print(f"[Model Cache] Could not save model: {e}")
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        if len(entries) <= self.max_disk_entries:
+            return
+        # Least recently used first
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Shared by every session in the process
+forecaster_cache = ForecasterCache()
@@ -3,11 +3,12 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
+from src.utils.metrics import timed
 
 
+# Model features, in the order they are passed to the regressor
+FEATURE_COLS = ["days_until_flight", "day_of_week", "is_weekend", "month", "days_from_target"]
+
 class TravelForecaster:
     """
     Travel price forecaster that analyzes flight prices and recommends
@@ -24,12 +25,13 @@ class TravelForecaster:
         self.target_date = None
         self.min_price_data = None
         
+    @timed("valyzer_forecaster_seconds", stage="preprocess")
     def preprocess(self, df: pd.DataFrame, flight_date: str) -> pd.DataFrame:
         """
         Preprocess the flight data for training.
         
         Args:
-            df: DataFrame with columns ['date', 'price', ...]
+            df: DataFrame with columns ['date', 'price', ...] (numeric price)
             flight_date: Target flight date (the date user wants to travel)
             
         Returns:
@@ -42,12 +44,20 @@ class TravelForecaster:
         # Parse date and price
         df["ds"] = pd.to_datetime(df["date"])
         
-        # Extract numeric price (handle formats like "123.45 EUR" or "123.45 EUR - for [2 Adults]")
-        df["y"] = df["price"].astype(str).str.extract(r'([\d.]+)')[0].astype(float)
+        # Prices come as float64 from travel_scraper; older formatted strings like
+        # "123.45 EUR - for [2 Adults]" are still parsed for backwards compatibility
+        if pd.api.types.is_numeric_dtype(df["price"]):
+            df["y"] = df["price"].astype(float)
+        else:
+            df["y"] = df["price"].astype(str).str.extract(r'([\d.]+)')[0].astype(float)
         
         # Calculate days until flight for each row
         # This represents: "How many days before the flight date is this price for?"
-        df["days_until_flight"] = (df["ds"] - today).dt.days
+        # Rows from the fare history carry the time they were observed, live searches were observed today
+        if "observed_at" in df.columns:
+            df["days_until_flight"] = (df["ds"] - pd.to_datetime(df["observed_at"]).dt.normalize()).dt.days
+        else:
+            df["days_until_flight"] = (df["ds"] - today).dt.days
         
         # Feature engineering
         df["day_of_week"] = df["ds"].dt.dayofweek  # 0=Monday, 6=Sunday
@@ -58,16 +68,17 @@ class TravelForecaster:
         # Days from target date (negative = before target, positive = after target)
         df["days_from_target"] = (df["ds"] - self.target_date).dt.days
         
-        # Keep minimum price per date (best offer for each day)
-        df_grouped = df.groupby("ds").agg({
+        # Keep minimum price per date (best offer for each day, per observation day for history;
+        # live searches have a single days_until_flight per date)
+        df_grouped = df.groupby(["ds", "days_until_flight"]).agg({
             "y": "min",
-            "days_until_flight": "first",
             "day_of_week": "first",
             "is_weekend": "first",
             "week_of_year": "first",
             "month": "first",
             "days_from_target": "first"
         }).reset_index()
+        df_grouped = df_grouped[["ds", "y", "days_until_flight", "day_of_week", "is_weekend", "week_of_year", "month", "days_from_target"]]
         
         print(f"\n[DEBUG] Preprocessed {len(df_grouped)} unique dates")
         print(f"[DEBUG] Target flight date: {self.target_date.strftime('%Y-%m-%d')}")
@@ -75,6 +86,7 @@ class TravelForecaster:
         
         return df_grouped
     
+    @timed("valyzer_forecaster_seconds", stage="train")
     def train(self, df: pd.DataFrame):
         """
         Train the forecasting model using the preprocessed data.
@@ -90,9 +102,13 @@ class TravelForecaster:
             self.rmse = None
             return
             
+        # scikit-learn takes about a second to import, so it is loaded on first training instead of with the page
+        from sklearn.ensemble import GradientBoostingRegressor
+        from sklearn.model_selection import train_test_split
+        from sklearn.metrics import mean_squared_error
+
         # Features for training
-        feature_cols = ["days_until_flight", "day_of_week", "is_weekend", "month", "days_from_target"]
-        X = df[feature_cols].values
+        X = df[FEATURE_COLS].to_numpy(dtype=float)
         y = df["y"].values
         
         # Train-test split (if enough data)
@@ -121,6 +137,39 @@ class TravelForecaster:
         # Store the data for recommendations
         self.min_price_data = df.copy()
     
+    def train_from_history(self, history_store, origin: str, destination: str, travel_class: str,
+                           flight_date: str, currency: str = "EUR", adults: int = 1, days_window: int = 30) -> pd.DataFrame:
+        """
+        Train on the accumulated fare history instead of a single search snapshot.
+        
+        Args:
+            history_store: FareHistoryStore (or anything with the same query() method)
+            origin, destination, travel_class: Route to train on
+            flight_date: Target flight date
+            currency: Only use prices recorded in this currency (prices in different currencies are never mixed)
+            adults: Only use searches for this many adults (prices are per search, not per person)
+            days_window: Departure dates within this many days of the target are used
+            
+        Returns:
+            The preprocessed training frame (empty if there is no history for the route)
+        """
+        target = pd.to_datetime(flight_date)
+        df = history_store.query(
+            origin, destination, travel_class,
+            start_date=target - timedelta(days=days_window),
+            end_date=target + timedelta(days=days_window),
+            currency=currency or "EUR",
+            adults=adults
+        )
+        if df.empty:
+            print("[WARNING] No fare history for this route")
+            self.rmse = None
+            return df
+
+        df_clean = self.preprocess(df, flight_date)
+        self.train(df_clean)
+        return df_clean
+
     def forecast(self, flight_date: str, window: int = 14) -> pd.DataFrame:
         """
         Generate price forecasts for buying tickets at different days before the flight.
@@ -132,47 +181,40 @@ class TravelForecaster:
         Returns:
             DataFrame with forecasted prices for each purchase day
         """
+        df_future = self.forecast_many([flight_date])
+        if df_future.empty:
+            return df_future
+
+        df_future = df_future.drop(columns="target_date")
+        self.forecast_df = df_future
+        return df_future
+
+    @timed("valyzer_forecaster_seconds", stage="forecast")
+    def forecast_many(self, flight_dates) -> pd.DataFrame:
+        """
+        Forecast prices for several target flight dates (e.g. both legs of a round trip,
+        or every date in the search window) with a single predict call.
+        
+        Args:
+            flight_dates: Iterable of target flight dates
+            
+        Returns:
+            Long-format DataFrame with one row per (target_date, purchase day)
+        """
         if self.model is None:
             return pd.DataFrame()
-            
-        target_date = pd.to_datetime(flight_date)
+
         today = pd.to_datetime(datetime.today().date())
-        
-        # Generate dates from today to flight date
-        days_to_flight = (target_date - today).days
-        
-        if days_to_flight <= 0:
-            # Flight is today or in the past
-            return pd.DataFrame()
-        
-        # Create future dates for prediction (from today to flight date)
-        future_dates = pd.date_range(today, target_date - timedelta(days=1))
-        
-        # Build prediction dataframe
-        predictions = []
-        for purchase_date in future_dates:
-            days_until = (target_date - purchase_date).days
-            
-            features = {
-                "ds": purchase_date,
-                "days_until_flight": days_until,
-                "day_of_week": purchase_date.dayofweek,
-                "is_weekend": purchase_date.dayofweek >= 5,
-                "month": purchase_date.month,
-                "days_from_target": (purchase_date - target_date).days
-            }
-            predictions.append(features)
-        
-        if not predictions:
+        df_future = self._build_future_features(flight_dates, today)
+
+        if df_future.empty:
+            # Every flight is today or in the past
             return pd.DataFrame()
-            
-        df_future = pd.DataFrame(predictions)
-        
-        # Predict prices
-        feature_cols = ["days_until_flight", "day_of_week", "is_weekend", "month", "days_from_target"]
-        X_future = df_future[feature_cols].values
+
+        # Predict prices for all targets at once
+        X_future = df_future[FEATURE_COLS].to_numpy(dtype=float)
         df_future["yhat"] = self.model.predict(X_future)
-        
+
         # Add confidence interval (simple estimate based on RMSE)
         if self.rmse:
             df_future["yhat_lower"] = df_future["yhat"] - 1.96 * self.rmse
@@ -180,9 +222,62 @@ class TravelForecaster:
         else:
             df_future["yhat_lower"] = df_future["yhat"]
             df_future["yhat_upper"] = df_future["yhat"]
-        
-        self.forecast_df = df_future
+
         return df_future
+
+    @staticmethod
+    def _build_future_features(flight_dates, today) -> pd.DataFrame:
+        """
+        Build the feature matrix for every purchase day from today up to the day before
+        each target date, using array arithmetic instead of a per-day loop.
+        """
+        targets = pd.to_datetime(pd.Index(list(flight_dates))).normalize().values.astype("datetime64[D]")
+        today = np.datetime64(pd.Timestamp(today).date(), "D")
+        days_to_flight = (targets - today).astype(np.int64)
+
+        valid = days_to_flight > 0
+        targets = targets[valid]
+        counts = days_to_flight[valid]
+        total = int(counts.sum())
+        if total == 0:
+            return pd.DataFrame()
+
+        # Purchase day offsets 0..count-1 for each target, concatenated
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        purchase_dates = today + offsets
+        days_until = np.repeat(counts, counts) - offsets
+
+        # Calendar features straight from the day numbers (1970-01-01 was a Thursday)
+        day_of_week = (purchase_dates.astype(np.int64) + 3) % 7
+        month = purchase_dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+
+        return pd.DataFrame({
+            "target_date": np.repeat(targets, counts).astype("datetime64[ns]"),
+            "ds": purchase_dates.astype("datetime64[ns]"),
+            "days_until_flight": days_until,
+            "day_of_week": day_of_week,
+            "is_weekend": day_of_week >= 5,
+            "month": month,
+            "days_from_target": -days_until
+        })
+
+    @staticmethod
+    def recommend_buy_days(forecast_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Recommend the best day to buy for every target date of a forecast_many result.
+        
+        Returns:
+            DataFrame with columns ['target_date', 'days_before', 'predicted_price']
+        """
+        if forecast_df is None or forecast_df.empty:
+            return pd.DataFrame(columns=["target_date", "days_before", "predicted_price"])
+
+        best_rows = forecast_df.loc[forecast_df.groupby("target_date")["yhat"].idxmin()]
+        return pd.DataFrame({
+            "target_date": best_rows["target_date"].to_numpy(),
+            "days_before": best_rows["days_until_flight"].astype(int).to_numpy(),
+            "predicted_price": best_rows["yhat"].round(2).to_numpy()
+        })
     
     def recommend_buy_day(self) -> tuple:
         """
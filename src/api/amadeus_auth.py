@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from src.api.request_scheduler import amadeus_scheduler
+from src.config.config import AMADEUS_BASE_URL, AMADEUS_TOKEN_CACHE_FILE, AMADEUS_TOKEN_REFRESH_MARGIN
+from src.utils.metrics import metrics
+
+try:
+    import fcntl  # POSIX only, used to collapse refreshes across worker processes
+except ImportError:
+    fcntl = None
+
+
+class AmadeusTokenManager:
+    """
+    Lazily fetches the Amadeus OAuth token and caches it until shortly before it expires.
+    Concurrent refreshes are collapsed behind a lock, and when a cache file is configured
+    the token is shared with other worker processes through it.
+    """
+
+    TOKEN_URL = f"{AMADEUS_BASE_URL}/v1/security/oauth2/token"
+
+    def __init__(self, api_key, api_secret, refresh_margin=AMADEUS_TOKEN_REFRESH_MARGIN, cache_file=AMADEUS_TOKEN_CACHE_FILE):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.refresh_margin = refresh_margin
+        self.cache_file = cache_file
+        self.refresh_count = 0
+        self._token = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        # Different credentials must never pick up each other's persisted token
+        self._key_id = hashlib.sha256(f"{api_key}".encode("utf-8")).hexdigest()[:16]
+
+    def _is_fresh(self, expires_at):
+        return time.time() < expires_at - self.refresh_margin
+
+    def get_token(self, force_refresh=False):
+        """
+        Returns a valid access token, fetching a new one only when the cached token is
+        missing or about to expire (within refresh_margin seconds).
+        """
+        token, expires_at = self._token, self._expires_at
+        if token and not force_refresh and self._is_fresh(expires_at):
+            return token
+
+        with self._lock:
+            # Another thread may have refreshed while we were waiting for the lock
+            if self._token and not force_refresh and self._is_fresh(self._expires_at):
+                return self._token
+            self._refresh(force_refresh)
+            return self._token
+
+    def invalidate(self, token=None):
+        """
+        Drops the cached token after the API rejected it (401).
+        If token is given, only that token is dropped, so several threads reporting the
+        same rejected token trigger a single refresh.
+        """
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = 0.0
+                self._remove_persisted(token)
+
+    def _refresh(self, force_refresh=False):
+        if not self.cache_file:
+            self._store(*self._fetch())
+            return
+
+        lock_file = self._open_lock_file()
+        try:
+            # Another process may have refreshed the shared token in the meantime
+            persisted = None if force_refresh else self._load_persisted()
+            if persisted and self._is_fresh(persisted[1]):
+                self._token, self._expires_at = persisted
+                return
+            self._store(*self._fetch())
+            self._save_persisted()
+        finally:
+            self._close_lock_file(lock_file)
+
+    def _fetch(self):
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": self.api_key,
+            "client_secret": self.api_secret
+        }
+        response = amadeus_scheduler.post("auth", self.TOKEN_URL, headers=headers, data=data)
+        response.raise_for_status()
+        payload = response.json()
+        self.refresh_count += 1
+        metrics.inc("valyzer_amadeus_token_refreshes_total")
+        return payload["access_token"], time.time() + float(payload.get("expires_in", 1799))
+
+    def _store(self, token, expires_at):
+        self._token = token
+        self._expires_at = expires_at
+
+    # Cross-process persistence
+    #-------------------------------------------------------------------
+    def _open_lock_file(self):
+        if fcntl is None:
+            return None
+        try:
+            lock_file = open(f"{self.cache_file}.lock", "a")
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            return lock_file
+        except OSError as e:
+            print(f"[WARN] Token cache lock unavailable: {e}")
+            return None
+
+    def _close_lock_file(self, lock_file):
+        if lock_file is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _load_persisted(self):
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key_id") != self._key_id:
+                return None
+            return data["access_token"], float(data["expires_at"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_persisted(self):
+        directory = os.path.dirname(self.cache_file) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".amadeus_token")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"key_id": self._key_id, "access_token": self._token, "expires_at": self._expires_at}, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            print(f"[WARN] Could not persist Amadeus token: {e}")
+
+    def _remove_persisted(self, token):
+        if not self.cache_file:
+            return
+        persisted = self._load_persisted()
+        if persisted and (token is None or persisted[0] == token):
+            try:
+                os.remove(self.cache_file)
+            except OSError:
+                pass
+
+
+_token_managers = {}
+_token_managers_lock = threading.Lock()
+
+
+def get_token_manager(api_key, api_secret):
+    """
+    Returns the process-wide token manager for a set of credentials.
+    """
+    with _token_managers_lock:
+        manager = _token_managers.get(api_key)
+        if manager is None or manager.api_secret != api_secret:
+            manager = _token_managers[api_key] = AmadeusTokenManager(api_key, api_secret)
+        return manager
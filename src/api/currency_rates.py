@@ -0,0 +1,72 @@
+import threading
+import time
+from src.api.http_client import http_client
+from src.config.config import FRANKFURTER_BASE_URL, FX_RATES_TTL
+from src.utils.metrics import metrics
+
+
+class CurrencyRates:
+    """
+    Process-wide exchange rate table backed by the Frankfurter API.
+    Rates are fetched at most once per base currency per TTL and shared by every caller.
+    """
+
+    def __init__(self, ttl=FX_RATES_TTL):
+        self.ttl = ttl
+        self._tables = {}  # base_currency -> (fetched_at, rates)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _base_lock(self, base_currency):
+        with self._lock:
+            return self._locks.setdefault(base_currency, threading.Lock())
+
+    def get_rates(self, base_currency="EUR"):
+        """
+        Returns a {currency: rate} dictionary for the base currency, or None if the rates could not be fetched.
+        Concurrent callers for the same base currency wait for a single request.
+        """
+        with self._base_lock(base_currency):
+            cached = self._tables.get(base_currency)
+            if cached and time.monotonic() - cached[0] < self.ttl:
+                metrics.inc("valyzer_cache_operations_total", cache="currency_rates", endpoint=base_currency, outcome="hits")
+                return dict(cached[1])
+            metrics.inc("valyzer_cache_operations_total", cache="currency_rates", endpoint=base_currency, outcome="misses")
+
+            url = f"{FRANKFURTER_BASE_URL}/latest?from={base_currency}"
+            response = http_client.get(url)
+            if response.status_code != 200:
+                print(f"API error: {response.status_code}")
+                return None
+
+            rates = response.json().get("rates", {})
+            rates[base_currency] = 1.0
+            self._tables[base_currency] = (time.monotonic(), rates)
+            return dict(rates)
+
+    def get_rate(self, from_currency, to_currency):
+        """
+        Returns the multiplier that converts from_currency amounts into to_currency.
+        """
+        if from_currency == to_currency:
+            return 1.0
+        rates = self.get_rates(base_currency=from_currency)
+        if rates is None:
+            raise Exception("Failed to get exchange rates")
+        if to_currency not in rates:
+            raise Exception(f"Currency {to_currency} not found in rates")
+        return rates[to_currency]
+
+    def convert(self, amount, from_currency, to_currency):
+        """
+        Converts a scalar, numpy array or pandas Series in one step.
+        """
+        return amount * self.get_rate(from_currency, to_currency)
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+# Shared by every travel_scraper instance in the process
+currency_rates = CurrencyRates()
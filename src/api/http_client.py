@@ -0,0 +1,108 @@
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from src.config.config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_MAXSIZE
+from src.utils.metrics import metrics
+
+
+class HttpClient:
+    """
+    Shared HTTP client for every upstream API (Amadeus, Frankfurter, OpenWeatherMap).
+    Keeps one keep-alive requests.Session per host with a sized connection pool,
+    so repeated calls reuse TCP+TLS connections instead of handshaking each time.
+    """
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), pool_maxsize=HTTP_POOL_MAXSIZE):
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self._sessions = {}
+        self._request_counts = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        return session
+
+    def session(self, host):
+        """
+        Returns the pooled session for a host, creating it on first use.
+        """
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = self._create_session()
+                self._request_counts[host] = 0
+            self._request_counts[host] += 1
+            return session
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        parts = urlsplit(url)
+        session = self.session(parts.netloc)
+        if not metrics.enabled:
+            return session.request(method, url, **kwargs)
+
+        # Labelled by path without the query string, so every endpoint is a single series
+        started = time.perf_counter()
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException as e:
+            metrics.inc("valyzer_upstream_errors_total", host=parts.netloc, path=parts.path, error=type(e).__name__)
+            raise
+        finally:
+            metrics.observe("valyzer_upstream_request_seconds", time.perf_counter() - started, host=parts.netloc, path=parts.path)
+        metrics.inc("valyzer_upstream_requests_total", host=parts.netloc, path=parts.path, status=response.status_code)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def pool_stats(self):
+        """
+        Returns per-host connection pool statistics.
+        connections_opened lower than requests means connections are being reused.
+        """
+        with self._lock:
+            sessions = dict(self._sessions)
+            request_counts = dict(self._request_counts)
+
+        stats = {}
+        for host, session in sessions.items():
+            connections_opened = 0
+            idle_connections = 0
+            adapter = session.get_adapter(f"https://{host}")
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                connections_opened += pool.num_connections
+                if pool.pool is not None:
+                    # The pool queue is pre-filled with None placeholders for connections never opened
+                    idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+            stats[host] = {
+                "requests": request_counts.get(host, 0),
+                "connections_opened": connections_opened,
+                "idle_connections": idle_connections,
+                "pool_maxsize": self.pool_maxsize,
+            }
+        return stats
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._request_counts.clear()
+
+
+# Shared by every API class in the process
+http_client = HttpClient()
@@ -0,0 +1,279 @@
+import itertools
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from src.api.http_client import http_client
+from src.utils.metrics import metrics
+from src.config.config import (
+    AMADEUS_MAX_TPS, AMADEUS_MAX_BURST, AMADEUS_RATE_SAFETY, AMADEUS_RATE_LIMITS, AMADEUS_DEFAULT_RATE_LIMIT,
+    AMADEUS_MAX_RETRIES, AMADEUS_RETRY_BACKOFF, AMADEUS_MAX_BACKOFF
+)
+
+
+# Priority lanes, lower runs first
+PRIORITY_INTERACTIVE = 0  # searches the user is waiting for
+PRIORITY_PREFETCH = 1     # cache warming ahead of the user
+PRIORITY_BACKGROUND = 2   # enrichment such as hotel rating lookups
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a request's deadline passes before it could be sent (or retried).
+    """
+
+
+class TokenBucket:
+    """
+    Allows `rate` requests per second on average with bursts of up to `capacity`.
+    Not thread-safe on its own; RequestScheduler guards it with its lock.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _Family:
+    """
+    Rate limit state and quota counters for one endpoint family.
+    """
+
+    def __init__(self, rate):
+        self.bucket = TokenBucket(rate)
+        self.blocked_until = 0.0  # set from Retry-After on 429
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.queued = 0
+        self.minute = None
+        self.minute_count = 0
+        self.month = None
+        self.month_count = 0
+
+    def wait_time(self, now):
+        return max(self.blocked_until - now, self.bucket.wait_time(now))
+
+    def count_request(self):
+        now = datetime.now()
+        minute = now.strftime("%Y-%m-%dT%H:%M")
+        month = now.strftime("%Y-%m")
+        if minute != self.minute:
+            self.minute, self.minute_count = minute, 0
+        if month != self.month:
+            self.month, self.month_count = month, 0
+        self.requests += 1
+        self.minute_count += 1
+        self.month_count += 1
+
+
+class RequestScheduler:
+    """
+    Central gate for every Amadeus request.
+
+    Each endpoint family ("flight-offers", "hotel-sentiments", ...) has its own token bucket,
+    and all families share a global bucket for the per-user transaction limit (paced at
+    `safety` times max_tps). Waiting requests are released in priority order (interactive searches
+    before prefetch and rating lookups), and requests whose caller set a deadline are dropped
+    once it passes instead of holding their place in the queue. A 429 with Retry-After blocks the
+    family for that period; without one, only the rate limited request backs off before its retry.
+    Per-minute / per-month request counters are kept for monitoring.
+    """
+
+    def __init__(self, max_tps=AMADEUS_MAX_TPS, rate_limits=AMADEUS_RATE_LIMITS, default_rate=AMADEUS_DEFAULT_RATE_LIMIT,
+                 max_retries=AMADEUS_MAX_RETRIES, backoff=AMADEUS_RETRY_BACKOFF, max_backoff=AMADEUS_MAX_BACKOFF, client=http_client,
+                 max_burst=AMADEUS_MAX_BURST, safety=AMADEUS_RATE_SAFETY):
+        self.rate_limits = dict(rate_limits)
+        self.default_rate = default_rate
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.client = client
+        self._global = TokenBucket(max_tps * safety, max_burst)
+        self._families = {}
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+
+    def _family(self, name):
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = _Family(self.rate_limits.get(name, self.default_rate))
+        return family
+
+    # Admission
+    #-------------------------------------------------------------------
+    def _wait_time(self, ticket, now):
+        """
+        Seconds the ticket still has to wait, None to wait for another request to go first.
+        """
+        family_wait = self._family(ticket[2]).wait_time(now)
+        if family_wait > 0:
+            return family_wait
+
+        # A higher priority request that could go now takes the next global token
+        for other in self._waiting:
+            if other < ticket and self._family(other[2]).wait_time(now) <= 0:
+                return None
+
+        return self._global.wait_time(now)
+
+    def acquire(self, family, priority=PRIORITY_INTERACTIVE, deadline=None):
+        """
+        Blocks until a request of this family and priority may be sent.
+        Returns the number of seconds spent waiting.
+        deadline is a time.monotonic() value; DeadlineExceeded is raised if it passes first.
+        """
+        started = time.monotonic()
+        ticket = (priority, next(self._sequence), family)
+        with self._cond:
+            self._waiting.append(ticket)
+            self._family(family).queued += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(ticket, now)
+                    if wait is not None and wait <= 0:
+                        self._global.take(now)
+                        self._family(family).bucket.take(now)
+                        break
+                    if deadline is not None:
+                        if now >= deadline:
+                            raise DeadlineExceeded(f"{family} request dropped, its deadline passed while queued")
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    self._cond.wait(wait)
+            finally:
+                self._waiting.remove(ticket)
+                state = self._family(family)
+                state.queued -= 1
+                waited = time.monotonic() - started
+                state.wait_seconds += waited
+                self._cond.notify_all()
+        return waited
+
+    def _throttle(self, family, retry_after=None):
+        with self._cond:
+            state = self._family(family)
+            state.throttled += 1
+            if retry_after is not None:
+                # Upstream asked every client request to wait, not just this one
+                state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+                self._cond.notify_all()
+
+    # Requests
+    #-------------------------------------------------------------------
+    def request(self, family, method, url, priority=PRIORITY_INTERACTIVE, deadline=None, **kwargs):
+        """
+        Sends a request through the scheduler and returns the response.
+        Rate limited (429) responses are retried up to max_retries times, after that the
+        429 response is returned to the caller.
+        Raises DeadlineExceeded if deadline (time.monotonic()) passes before the request or a retry is sent.
+        """
+        attempt = 0
+        while True:
+            waited = self.acquire(family, priority, deadline)
+            metrics.observe("valyzer_amadeus_queue_seconds", waited, family=family)
+            with self._cond:
+                self._family(family).count_request()
+            response = self.client.request(method, url, **kwargs)
+
+            if response.status_code != 429:
+                return response
+
+            retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                retry_after = min(retry_after, self.max_backoff)
+            self._throttle(family, retry_after)
+            metrics.inc("valyzer_amadeus_throttled_total", family=family)
+            if attempt >= self.max_retries:
+                print(f"[Scheduler] {family} rate limited, giving up after {self.max_retries} retries")
+                return response
+
+            delay = retry_after if retry_after is not None else self._backoff_delay(attempt)
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise DeadlineExceeded(f"{family} rate limited, retrying in {delay:.1f}s would miss the deadline")
+            attempt += 1
+            metrics.inc("valyzer_amadeus_retries_total", family=family)
+            print(f"[Scheduler] {family} rate limited, retrying in {delay:.1f}s (retry {attempt}/{self.max_retries})")
+            with self._cond:
+                self._family(family).retries += 1
+            if retry_after is None:
+                # The backoff is this request's own; the rest of the family keeps its pace
+                time.sleep(delay)
+
+    def get(self, family, url, priority=PRIORITY_INTERACTIVE, deadline=None, **kwargs):
+        return self.request(family, "GET", url, priority=priority, deadline=deadline, **kwargs)
+
+    def post(self, family, url, priority=PRIORITY_INTERACTIVE, deadline=None, **kwargs):
+        return self.request(family, "POST", url, priority=priority, deadline=deadline, **kwargs)
+
+    def _backoff_delay(self, attempt):
+        # Exponential backoff with jitter so parallel workers don't retry in lockstep
+        delay = self.backoff * (2 ** attempt)
+        return min(delay * random.uniform(1.0, 1.25), self.max_backoff)
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Parses a Retry-After header (delay in seconds or an HTTP date) into seconds.
+        """
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+        except (TypeError, ValueError):
+            return None
+
+    # Monitoring
+    #-------------------------------------------------------------------
+    def stats(self):
+        """
+        Returns per-family request counters: total, this minute and this month, 429s received,
+        retries, requests currently queued and total seconds spent waiting for a slot.
+        """
+        current_minute = datetime.now().strftime("%Y-%m-%dT%H:%M")
+        current_month = datetime.now().strftime("%Y-%m")
+        with self._cond:
+            now = time.monotonic()
+            return {
+                name: {
+                    "requests": family.requests,
+                    "requests_this_minute": family.minute_count if family.minute == current_minute else 0,
+                    "requests_this_month": family.month_count if family.month == current_month else 0,
+                    "throttled": family.throttled,
+                    "retries": family.retries,
+                    "queued": family.queued,
+                    "wait_seconds": round(family.wait_seconds, 3),
+                    "blocked_for": round(max(family.blocked_until - now, 0.0), 3),
+                    "rate_limit": family.bucket.rate,
+                }
+                for name, family in self._families.items()
+            }
+
+
+# Shared by every Amadeus call in the process
+amadeus_scheduler = RequestScheduler()
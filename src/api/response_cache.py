@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from src.config.config import (
+    RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_ENTRIES,
+    RESPONSE_CACHE_TTLS, RESPONSE_CACHE_DEFAULT_TTL
+)
+from src.utils.metrics import metrics
+
+# Backends run size-bounded eviction once every this many writes
+_EVICT_EVERY = 64
+
+
+class MemoryBackend:
+    """
+    Per-process LRU store. Values are kept by reference and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    Host-wide store shared by every process (e.g. Streamlit replicas) through one SQLite file.
+    Values are stored as JSON. When the table grows past max_entries, expired entries and
+    then the ones closest to expiry are evicted.
+    """
+
+    def __init__(self, path=None, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.path = path or os.path.join(RESPONSE_CACHE_PATH, "responses.sqlite")
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_expires ON responses (expires_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0])
+
+    def set(self, key, value, expires_at):
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)", (key, json.dumps(value), expires_at))
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self):
+        conn = self._conn()
+        conn.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+        excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute("DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY expires_at LIMIT ?)", (excess,))
+
+    def delete(self, key):
+        self._conn().execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM responses")
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class FileBackend:
+    """
+    Host-wide store with one JSON file per entry. Oldest files are evicted past max_entries.
+    """
+
+    def __init__(self, directory=None, max_entries=RESPONSE_CACHE_MAX_ENTRIES):
+        self.directory = directory or os.path.join(RESPONSE_CACHE_PATH, "responses")
+        self.max_entries = max_entries
+        self._writes = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key or entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("value")
+
+    def set(self, key, value, expires_at):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "expires_at": expires_at, "value": value}, f)
+        os.replace(tmp_path, self._path(key))
+        self._writes += 1
+        if self._writes % _EVICT_EVERY == 0:
+            self.evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory) if os.path.isdir(self.directory) else []:
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        return entries
+
+    def evict(self):
+        entries = sorted(self._entries())
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self._entries())
+
+
+class ResponseCache:
+    """
+    Cache for upstream API responses keyed on an endpoint name and normalized parameters,
+    with per-endpoint TTLs and a pluggable backend (memory, sqlite or file).
+    `name` labels the cache in the exported metrics.
+    """
+
+    def __init__(self, backend=None, ttls=None, default_ttl=RESPONSE_CACHE_DEFAULT_TTL, name="response"):
+        self.name = name
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttls = dict(RESPONSE_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._in_flight = {}  # key -> Future of the fetch running for it
+
+    @staticmethod
+    def make_key(endpoint, params):
+        return f"{endpoint}:{json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)}"
+
+    def _count(self, endpoint, outcome):
+        with self._lock:
+            counters = self._stats.setdefault(endpoint, {"hits": 0, "misses": 0, "sets": 0})
+            counters[outcome] += 1
+        metrics.inc("valyzer_cache_operations_total", cache=self.name, endpoint=endpoint, outcome=outcome)
+
+    def get(self, endpoint, params):
+        """
+        Returns the cached value, or None on a miss (or if the backend is unavailable).
+        """
+        try:
+            value = self.backend.get(self.make_key(endpoint, params))
+        except Exception as e:
+            print(f"[Response Cache] Read failed: {e}")
+            value = None
+        self._count(endpoint, "misses" if value is None else "hits")
+        return value
+
+    def set(self, endpoint, params, value, ttl=None):
+        ttl = self.ttls.get(endpoint, self.default_ttl) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        try:
+            self.backend.set(self.make_key(endpoint, params), value, time.time() + ttl)
+            self._count(endpoint, "sets")
+        except Exception as e:
+            print(f"[Response Cache] Write failed: {e}")
+
+    def get_or_fetch(self, endpoint, params, fetch, cacheable=None, known_miss=False):
+        """
+        Returns the cached value or calls fetch() and caches its result
+        (only if cacheable(result) is true, when given).
+        Concurrent misses for the same key wait for a single fetch() and share its result
+        (uncacheable ones such as error dicts included), so identical searches from several
+        sessions cost one upstream request. An exception raised by fetch() (e.g. the caller's own
+        deadline passing) is not shared: waiting callers retry the fetch themselves.
+        known_miss=True means the caller's own get() just missed: the lookup is not repeated,
+        so the miss is counted once.
+        """
+        if not known_miss:
+            value = self.get(endpoint, params)
+            if value is not None:
+                return value
+
+        key = self.make_key(endpoint, params)
+        while True:
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._in_flight[key] = Future()
+            if leader:
+                break
+            try:
+                return future.result()
+            except Exception:
+                continue
+
+        try:
+            # A fetch for the same key may have finished between the miss and taking the lead
+            try:
+                value = self.backend.get(key)
+            except Exception:
+                value = None
+            if value is None:
+                value = fetch()
+                if cacheable is None or cacheable(value):
+                    self.set(endpoint, params, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def invalidate(self, endpoint, params):
+        self.backend.delete(self.make_key(endpoint, params))
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Returns {endpoint: {"hits", "misses", "sets", "hit_ratio"}} for this process.
+        """
+        with self._lock:
+            stats = {endpoint: dict(counters) for endpoint, counters in self._stats.items()}
+        for counters in stats.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+        return stats
+
+
+def create_response_cache(backend=RESPONSE_CACHE_BACKEND, ttls=None):
+    """
+    Builds a ResponseCache with the named backend ("memory", "sqlite" or "file").
+    """
+    backends = {"memory": MemoryBackend, "sqlite": SQLiteBackend, "file": FileBackend}
+    if backend not in backends:
+        raise ValueError(f"Unknown response cache backend: {backend}")
+    return ResponseCache(backends[backend](), ttls=ttls)
+
+
+# Shared by every travel_scraper in the process (and, with sqlite/file, every process on the host)
+response_cache = create_response_cache()
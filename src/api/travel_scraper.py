@@ -1,30 +1,168 @@
 import requests
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import date, datetime, timedelta
 import pandas as pd
-from src.config.config import AMADEUS_API_KEY, AMADEUS_API_SECRET
+from src.config.config import (
+    AMADEUS_API_KEY, AMADEUS_API_SECRET, AMADEUS_BASE_URL, FETCH_MAX_WORKERS,
+    OFFER_COLUMNS_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTLS,
+    HOTEL_RATINGS_BATCH_SIZE, HOTEL_RATINGS_MAX_HOTELS, HOTEL_RATINGS_MAX_WORKERS
+)
+from src.api.currency_rates import currency_rates
+from src.api.amadeus_auth import get_token_manager
+from src.api.request_scheduler import amadeus_scheduler, DeadlineExceeded, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from src.api.response_cache import MemoryBackend, ResponseCache, response_cache
+from src.services.airport_registry import get_airport_registry
 from src.utils.country_utils import extract_iata
 
+# Column lists produced for every date by travel_scraper._parse_offers
+OFFER_COLUMNS = ("date", "price", "flight_type", "route", "departure_at", "arrival_at", "carriers", "flight_numbers")
+
+# Parsed offers per (route, date, class, adults), reused when search windows overlap
+offer_columns_cache = ResponseCache(
+    MemoryBackend(max_entries=OFFER_COLUMNS_CACHE_MAX_ENTRIES),
+    ttls={"flight-offer-columns": RESPONSE_CACHE_TTLS["flight-offers"]},
+    name="offer_columns"
+)
+
+
 class travel_scraper:
     def __init__(self, api_key=AMADEUS_API_KEY, api_secret=AMADEUS_API_SECRET):
         self.api_key = api_key
         self.api_secret = api_secret
-        self.token = self.get_access_token()
+        # The token is fetched lazily on the first Amadeus call and shared by every scraper in the process
+        self.token_manager = get_token_manager(api_key, api_secret)
+
+    @property
+    def token(self):
+        return self.token_manager.get_token()
 
     def get_access_token(self):
-        url = "https://test.api.amadeus.com/v1/security/oauth2/token"
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        data = {
-            "grant_type": "client_credentials",
-            "client_id": self.api_key,
-            "client_secret": self.api_secret
-        }
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        return response.json()["access_token"]
+        return self.token_manager.get_token()
 
     # Using the Amadeus API to fetch travel data information
-    def fetch_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7):
+    def fetch_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7, max_workers=FETCH_MAX_WORKERS, on_fetched=None):
+        """
+        Returns the flights DataFrame for the date window around travel_date, or an error dict.
+        on_fetched(date_str, fetched_at) is called for every date this call searched upstream
+        (dates served from a cache, or by a search another caller was already running, are not reported).
+        """
+        date_strs = self.get_date_window(travel_date, days_window)
+
+        # Extract IATA codes from the origin and destination strings
+        # Example: "Istanbul Airport (IST)" -> "IST"
+        origin_code = extract_iata(origin)
+        destination_code = extract_iata(destination)
+
+        # Every date is cached as an independent unit, so shifting the window by a day
+        # only fetches the dates that were not part of an earlier search
+        per_date, missing_dates = self._cached_date_columns(origin_code, destination_code, date_strs, classInfo, numOfAdults)
+
+        # Per-date searches are independent, so they can run concurrently (max_workers=1 keeps them sequential)
+        for date_str, columns, fetched_at in self._iter_searches(origin_code, destination_code, missing_dates, classInfo, numOfAdults, max_workers):
+            if "error" in columns:
+                return {"error": columns["error"], "status_code": columns["status_code"]}
+            per_date[date_str] = columns
+            if on_fetched is not None and fetched_at is not None:
+                on_fetched(date_str, fetched_at)
+
+        # Stitch cached and fresh dates back together in date order
+        columns = {column: [] for column in OFFER_COLUMNS}
+        for date_str in date_strs:
+            for column in OFFER_COLUMNS:
+                columns[column].extend(per_date[date_str][column])
+
+        return self._build_flights_frame(columns, origin_code, destination_code, numOfAdults, selected_currency)
+
+    def iter_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7, max_workers=FETCH_MAX_WORKERS, deadline=None):
+        """
+        Streaming variant of fetch_travel_data.
+        Yields one event per date as soon as it is available (cached dates first, then searches
+        in completion order): {"date", "data": typed DataFrame for that date, "completed", "total", "fetched_at"}.
+        fetched_at is when the date was searched upstream by this call, None when it came from a cache.
+        On an upstream error, yields {"error", "status_code", "date", "completed", "total"} and stops.
+        Searches still waiting for a rate limit slot when deadline (time.monotonic()) passes are dropped
+        and reported as a 504 error.
+        """
+        date_strs = self.get_date_window(travel_date, days_window)
+        origin_code = extract_iata(origin)
+        destination_code = extract_iata(destination)
+        total = len(date_strs)
+
+        per_date, missing_dates = self._cached_date_columns(origin_code, destination_code, date_strs, classInfo, numOfAdults)
+        completed = 0
+        for date_str in date_strs:
+            if date_str in per_date:
+                completed += 1
+                yield {
+                    "date": date_str,
+                    "data": self._build_flights_frame(per_date[date_str], origin_code, destination_code, numOfAdults, selected_currency),
+                    "completed": completed,
+                    "total": total,
+                    "fetched_at": None
+                }
+
+        for date_str, columns, fetched_at in self._iter_searches(origin_code, destination_code, missing_dates, classInfo, numOfAdults, max_workers, deadline):
+            completed += 1
+            if "error" in columns:
+                yield {"error": columns["error"], "status_code": columns["status_code"], "date": date_str, "completed": completed, "total": total}
+                return
+            yield {
+                "date": date_str,
+                "data": self._build_flights_frame(columns, origin_code, destination_code, numOfAdults, selected_currency),
+                "completed": completed,
+                "total": total,
+                "fetched_at": fetched_at
+            }
+
+    def _cached_date_columns(self, origin_code, destination_code, date_strs, classInfo, numOfAdults):
+        """
+        Splits the window into already-parsed dates ({date: columns}) and dates still to search.
+        """
+        per_date = {}
+        missing_dates = []
+        for date_str in date_strs:
+            cached = offer_columns_cache.get("flight-offer-columns", self._offer_cache_params(origin_code, destination_code, date_str, classInfo, numOfAdults))
+            if cached is not None:
+                per_date[date_str] = cached
+            else:
+                missing_dates.append(date_str)
+        return per_date, missing_dates
+
+    def _search_date_columns(self, origin_code, destination_code, date_str, classInfo, numOfAdults, deadline=None):
+        """
+        Searches one date and parses it into cached column lists (or the error dict).
+        Returns (columns, fetched_at): fetched_at is set only when this call got the offers from Amadeus.
+        Runs in the worker thread, so a search finished after the caller stopped listening is still cached.
+        """
+        fetched_at = None
+
+        def search():
+            nonlocal fetched_at
+            flights, fetched_at = self._search_flight_offers(origin_code, destination_code, date_str, classInfo, numOfAdults, deadline=deadline)
+            if isinstance(flights, dict) and "error" in flights:
+                return flights
+            return self._parse_offers(flights, date_str, origin_code, destination_code)
+
+        # Sessions searching overlapping windows at the same time parse each date once
+        try:
+            columns = offer_columns_cache.get_or_fetch(
+                "flight-offer-columns",
+                self._offer_cache_params(origin_code, destination_code, date_str, classInfo, numOfAdults),
+                search,
+                cacheable=lambda columns: "error" not in columns,
+                # Only called for dates _cached_date_columns already looked up and missed
+                known_miss=True
+            )
+        except DeadlineExceeded as e:
+            return {"error": str(e), "status_code": 504}, None
+        return columns, fetched_at
+
+    @staticmethod
+    def get_date_window(travel_date, days_window=7):
+        """
+        Returns the dates (YYYY-MM-DD) searched around travel_date.
+        """
         base_date = datetime.strptime(travel_date, "%Y-%m-%d")
 
         # Date range for future machine learning model
@@ -39,87 +177,127 @@ class travel_scraper:
         else:
             date_range = [base_date + timedelta(days=i) for i in range(-days_window, days_window + 1)]
 
+        return [d.strftime("%Y-%m-%d") for d in date_range]
+
+    @staticmethod
+    def _offer_cache_params(origin_code, destination_code, date, classInfo, numOfAdults):
+        # Equivalent searches share one cache entry, whatever string the page passed in
+        return {
+            "origin": origin_code.strip().upper(),
+            "destination": destination_code.strip().upper(),
+            "date": date,
+            "class": (classInfo or "ECONOMY").upper(),
+            "adults": int(numOfAdults)
+        }
 
-        # Extract IATA codes from the origin and destination strings
-        # Example: "Istanbul Airport (IST)" -> "IST"
-        origin_code = extract_iata(origin)
-        destination_code = extract_iata(destination)
-
-        all_flights = []
-
-        for date in date_range:
-            date_str = date.strftime("%Y-%m-%d")
-            flights = self.search_flights_amadeus(origin_code, destination_code, date_str, classInfo, numOfAdults)
+    @staticmethod
+    def _parse_offers(flights, date_str, origin_code, destination_code):
+        """
+        Parses one date's flight-offers response into column lists (prices still in EUR).
+        """
+        # Offers are collected column-wise; typing and currency conversion happen once per column afterwards
+        columns = {column: [] for column in OFFER_COLUMNS}
+
+        for offer in flights.get("data", []):
+            price = offer.get("price", {}).get("total")
+            for itinerary in offer.get("itineraries", []):
+                segments = itinerary.get("segments", [])
+                if not segments:
+                    continue
+
+                # segment[0] is the first flight segment (departure), segment[-1] is the last flight segment (arrival)
+                if segments[0]["departure"]["iataCode"] != origin_code or segments[-1]["arrival"]["iataCode"] != destination_code:
+                    continue
+
+                stops = len(segments) - 1
+
+                columns["date"].append(date_str)
+                columns["price"].append(price)
+                columns["flight_type"].append("Direct" if stops == 0 else "Connecting")
+                columns["route"].append(" → ".join([seg["departure"]["iataCode"] for seg in segments] + [segments[-1]["arrival"]["iataCode"]]))
+                columns["departure_at"].append(segments[0]["departure"]["at"])
+                columns["arrival_at"].append(segments[-1]["arrival"]["at"])
+                columns["carriers"].append(", ".join([seg["carrierCode"] for seg in segments]))
+                columns["flight_numbers"].append(", ".join([seg["carrierCode"] + seg["number"] for seg in segments]))
+
+        return columns
+
+    def _build_flights_frame(self, columns, origin_code, destination_code, numOfAdults, selected_currency):
+        """
+        Builds the typed flights DataFrame: float64 price, categorical currency, int adults,
+        datetime64 date/departure_at/arrival_at and a timedelta duration.
+        Display formatting is left to the caller.
+        """
+        departure_at = pd.to_datetime(pd.Series(columns["departure_at"], dtype="object"), format="ISO8601")
+        arrival_at = pd.to_datetime(pd.Series(columns["arrival_at"], dtype="object"), format="ISO8601")
+        prices = pd.to_numeric(pd.Series(columns["price"], dtype="object"), errors="coerce").astype("float64")
+
+        # Convert the whole price column at once with a single (cached) rate lookup
+        currency = selected_currency or "EUR"
+        if currency != "EUR" and len(prices):
+            try:
+                prices = currency_rates.convert(prices, "EUR", currency)
+            except Exception as e:
+                print(f"Currency conversion error: {e}")
+                currency = "EUR"
+
+        return pd.DataFrame({
+            "date": pd.to_datetime(pd.Series(columns["date"], dtype="object"), format="%Y-%m-%d"),
+            "origin": origin_code,
+            "destination": destination_code,
+            "price": prices,
+            "currency": pd.Categorical([currency] * len(prices)),
+            "adults": pd.Series([numOfAdults] * len(prices), dtype="int64"),
+            "flight_type": columns["flight_type"],
+            "route": columns["route"],
+            "duration": arrival_at - departure_at,
+            "departure_at": departure_at,
+            "arrival_at": arrival_at,
+            "carriers": columns["carriers"],
+            "flight_numbers": columns["flight_numbers"],
+        })
+
+    def _iter_searches(self, origin_code, destination_code, date_strs, classInfo, numOfAdults, max_workers=FETCH_MAX_WORKERS, deadline=None):
+        """
+        Searches every date in date_strs and yields (date, columns, fetched_at) in completion order.
+        Stops after the first error dict (searches not started yet are cancelled).
+        """
+        if not max_workers or max_workers <= 1 or len(date_strs) <= 1:
+            for date_str in date_strs:
+                columns, fetched_at = self._search_date_columns(origin_code, destination_code, date_str, classInfo, numOfAdults, deadline)
+                yield date_str, columns, fetched_at
+                if "error" in columns:
+                    return
+            return
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(date_strs)))
+        try:
+            futures = {
+                executor.submit(self._search_date_columns, origin_code, destination_code, date_str, classInfo, numOfAdults, deadline): date_str
+                for date_str in date_strs
+            }
+            for future in as_completed(futures):
+                columns, fetched_at = future.result()
+                yield futures[future], columns, fetched_at
+                if "error" in columns:
+                    return
+        finally:
+            # Don't wait for in-flight searches when failing fast (or when the consumer stops early)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def search_flights_amadeus(self, origin_code, destination_code, date, classInfo="ECONOMY", numOfAdults=1, priority=PRIORITY_INTERACTIVE, deadline=None):  # default classInfo is "ECONOMY" and numOfAdults is 1
+        try:
+            return self._search_flight_offers(origin_code, destination_code, date, classInfo, numOfAdults, priority, deadline)[0]
+        except DeadlineExceeded as e:
+            return {"error": str(e), "status_code": 504}
 
-            if isinstance(flights, dict) and "error" in flights:
-                return {"error": flights["error"], "status_code": flights["status_code"]}
-
-            for offer in flights.get("data", []):
-                price = offer.get("price", {}).get("total")
-                for itinerary in offer.get("itineraries", []):
-                    segments = itinerary.get("segments", [])
-                    if not segments:
-                        continue
-
-                    # segment[0] is the first flight segment (departure), segment[-1] is the last flight segment (arrival)
-                    if segments[0]["departure"]["iataCode"] != origin_code or segments[-1]["arrival"]["iataCode"] != destination_code:
-                        continue
-
-                    route = " → ".join([seg["departure"]["iataCode"] for seg in segments] + [segments[-1]["arrival"]["iataCode"]])
-                    carriers = ", ".join([seg["carrierCode"] for seg in segments])
-                    flight_numbers = ", ".join([seg["carrierCode"] + seg["number"] for seg in segments])
-                    departure_at = segments[0]["departure"]["at"]
-                    arrival_at = segments[-1]["arrival"]["at"]
-
-                    # Duration calculation
-                    departure_time = datetime.fromisoformat(departure_at.replace("Z", "+00:00"))
-                    arrival_time = datetime.fromisoformat(arrival_at.replace("Z", "+00:00"))
-                    duration_str = str(arrival_time - departure_time).split(", ")[-1]
-
-                    stops = len(segments) - 1
-                    flight_type = "Direct" if stops == 0 else "Connecting"
-
-                    try:
-                        # Convert price if currency is different
-                        if selected_currency != "EUR":
-                            converted_price = self.convert_currency(float(price), 'EUR', selected_currency)
-                            formatted_price = f"{converted_price:.2f} {selected_currency}"
-                        else:
-                            formatted_price = f"{float(price):.2f} EUR"
-
-                        # Append adult info
-                        if numOfAdults > 1:
-                            price_str = f"{formatted_price} - for [{numOfAdults} Adults]"
-                        else:
-                            price_str = formatted_price
-                    except Exception as e:
-                        print(f"Currency conversion error: {e}")
-                        price_str = f"{price} EUR (conversion failed)"
-
-                    all_flights.append({
-                        "date": date_str,
-                        "origin": origin_code,
-                        "destination": destination_code,
-                        "price": price_str,
-                        "flight_type": flight_type,
-                        "route": route,
-                        "duration": duration_str,
-                        "departure_time": departure_time.strftime("%H:%M"),
-                        "arrival_time": arrival_time.strftime("%H:%M"),
-                        #"departure_at": departure_at, # Uncomment if you want to include departureDate + departureTime in the output
-                        #"arrival_at": arrival_at, # Uncomment if you want to include arrivalDate + arrivalTime in the output
-                        "carriers": carriers,
-                        "flight_numbers": flight_numbers,
-                        #"stops": stops # Uncomment if you want to include transfer number in the output
-                    })
-
-        return pd.DataFrame(all_flights)
-
-
-
-    def search_flights_amadeus(self, origin_code, destination_code, date, classInfo="ECONOMY", numOfAdults=1):  # default classInfo is "ECONOMY" and numOfAdults is 1
-        url = "https://test.api.amadeus.com/v2/shopping/flight-offers"
-        headers = {"Authorization": f"Bearer {self.token}"}
+    def _search_flight_offers(self, origin_code, destination_code, date, classInfo="ECONOMY", numOfAdults=1, priority=PRIORITY_INTERACTIVE, deadline=None):
+        """
+        search_flights_amadeus returning (result, fetched_at): fetched_at is when this call
+        got the response from Amadeus, None when it was served from the cache or by another caller's search.
+        Raises DeadlineExceeded if deadline (time.monotonic()) passes before the search could be sent.
+        """
+        url = f"{AMADEUS_BASE_URL}/v2/shopping/flight-offers"
         params = {
             "originLocationCode": origin_code,
             "destinationLocationCode": destination_code,
@@ -130,14 +308,37 @@ class travel_scraper:
             "max": 10
         }
 
+        fetched_at = None
+
+        def fetch():
+            nonlocal fetched_at
+            result = self._fetch_flight_offers(url, params, priority, deadline)
+            fetched_at = datetime.now()
+            return result
+
+        # Identical searches running at the same time (other dates' workers, other sessions) share one request
+        result = response_cache.get_or_fetch(
+            "flight-offers",
+            self._offer_cache_params(origin_code, destination_code, date, classInfo, numOfAdults),
+            fetch,
+            cacheable=lambda result: "error" not in result
+        )
+        return result, fetched_at
+
+    def _fetch_flight_offers(self, url, params, priority=PRIORITY_INTERACTIVE, deadline=None):
+        """
+        Runs one flight-offers search against Amadeus; returns the response JSON or an error dict.
+        """
         try:
-            response = requests.get(url, headers=headers, params=params)
+            token = self.token
+            headers = {"Authorization": f"Bearer {token}"}
+            response = amadeus_scheduler.get("flight-offers", url, priority=priority, deadline=deadline, headers=headers, params=params)
 
             # If token expired, refresh it and retry once (401 error → get token again)
             if response.status_code == 401:
-                self.token = self.get_access_token()
+                self.token_manager.invalidate(token)
                 headers["Authorization"] = f"Bearer {self.token}"
-                response = requests.get(url, headers=headers, params=params)
+                response = amadeus_scheduler.get("flight-offers", url, priority=priority, deadline=deadline, headers=headers, params=params)
 
             if response.status_code == 400 and "INVALID DATE" in response.text:
                 # Flight not found: invalid date may have been entered
@@ -151,11 +352,15 @@ class travel_scraper:
 
             return response.json()
 
+        except DeadlineExceeded:
+            # Not an error of the search itself: callers sharing it retry under their own deadline
+            raise
+
         except requests.exceptions.HTTPError as http_err:
             print(f"HTTP error: {http_err}")
             return {
                 "error": str(http_err),
-                "status_code": response.status_code if response else 500
+                "status_code": http_err.response.status_code if http_err.response is not None else 500
             }
 
         except Exception as err:
@@ -169,24 +374,11 @@ class travel_scraper:
     # This function fetches the latest exchange rates from the Frankfurter API
     #-------------------------------------------------------------------
     def get_latest_rates(self, base_currency="EUR"):
-        url = f"https://api.frankfurter.app/latest?from={base_currency}"
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            rates = data.get("rates", {})
-            rates[base_currency] = 1.0 
-            return rates
-        else:
-            print(f"API error: {response.status_code}")
-            return None
+        # Served from the process-wide rate table, so repeated calls don't hit the network
+        return currency_rates.get_rates(base_currency=base_currency)
 
     def convert_currency(self, amount, from_currency, to_currency):
-        rates = self.get_latest_rates(base_currency=from_currency)
-        if rates is None:
-            raise Exception("Failed to get exchange rates")
-        if to_currency not in rates:
-            raise Exception(f"Currency {to_currency} not found in rates")
-        return amount * rates[to_currency]
+        return currency_rates.convert(amount, from_currency, to_currency)
 
 
     #-------------------------------------------------------------------
@@ -194,14 +386,20 @@ class travel_scraper:
     # Destination Experiences API by Amadeus
 
     def get_city_coordinates(self, city_name):
-        url = "https://test.api.amadeus.com/v1/reference-data/locations"
+        # Known cities and airports resolve from the bundled airport dataset without a round-trip,
+        # the Amadeus locations API is only asked about the rest
+        coordinates = get_airport_registry().geocode(city_name)
+        if coordinates:
+            return coordinates
+
+        url = f"{AMADEUS_BASE_URL}/v1/reference-data/locations"
         headers = {"Authorization": f"Bearer {self.token}"}
         params = {
             "keyword": city_name,
             "subType": "CITY"
         }
 
-        response = requests.get(url, headers=headers, params=params)
+        response = amadeus_scheduler.get("locations", url, headers=headers, params=params)
         response.raise_for_status()
 
         data = response.json()
@@ -226,13 +424,20 @@ class travel_scraper:
                 print(f"[WARN] Coordinates could not be obtained: {city_name}")
                 return []
 
-            response = requests.get(
-                "https://test.api.amadeus.com/v1/shopping/activities",
-                headers={"Authorization": f"Bearer {self.token}"},
-                params={"latitude": lat, "longitude": lon, "radius": 20}
-            )
-            response.raise_for_status()
-            return response.json().get("data", [])
+            params = {"latitude": lat, "longitude": lon, "radius": 20}
+
+            def fetch():
+                response = amadeus_scheduler.get(
+                    "activities",
+                    f"{AMADEUS_BASE_URL}/v1/shopping/activities",
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    params=params
+                )
+                response.raise_for_status()
+                return response.json().get("data", [])
+
+            # Failed lookups raise before anything is cached
+            return response_cache.get_or_fetch("activities", params, fetch)
 
         except requests.exceptions.HTTPError as e:
             print(f"[ERROR] Amadeus API error: {e}")
@@ -250,23 +455,30 @@ class travel_scraper:
     def fetch_hotels_by_city(self, destination):
         """
         Fetches hotel data for a given destination city using its IATA code.
-        Returns a list of hotel dictionaries with ratings (up to 3 rated hotels).
+        Returns a list of hotel dictionaries; the first HOTEL_RATINGS_MAX_HOTELS carry their rating
+        data under "ratings" (None when the hotel has no rating).
         """
         try:
             city_iata_code = extract_iata(destination)
-            response = requests.get(
-                f"https://test.api.amadeus.com/v1/reference-data/locations/hotels/by-city?cityCode={city_iata_code}",
-                headers={"Authorization": f"Bearer {self.token}"}
-            )
-            response.raise_for_status()
-            hotels = response.json().get("data", [])
+
+            def fetch():
+                response = amadeus_scheduler.get(
+                    "hotels",
+                    f"{AMADEUS_BASE_URL}/v1/reference-data/locations/hotels/by-city?cityCode={city_iata_code}",
+                    headers={"Authorization": f"Bearer {self.token}"}
+                )
+                response.raise_for_status()
+                return response.json().get("data", [])
+
+            # Cached values are shared, so the ratings are attached to copies
+            hotels = [dict(hotel) for hotel in response_cache.get_or_fetch("hotels", {"cityCode": city_iata_code}, fetch)]
 
             if not hotels:
                 print(f"[WARN] No hotels found for city: {city_iata_code}")
                 return []
 
-            # Get ratings only with first 10 hotel IDs
-            hotel_ids = [hotel.get("hotelId") for hotel in hotels if "hotelId" in hotel][:10]
+            # Rate every hotel the page can choose its top rated ones from
+            hotel_ids = [hotel.get("hotelId") for hotel in hotels if "hotelId" in hotel][:HOTEL_RATINGS_MAX_HOTELS]
             ratings = self.get_hotel_ratings(hotel_ids)
 
             # Match rating data by ID (if rating exists)
@@ -274,11 +486,7 @@ class travel_scraper:
 
             # Add ratings to hotel objects
             for hotel in hotels:
-                hotel_id = hotel.get("hotelId")
-                if hotel_id in rating_map:
-                    hotel["ratings"] = rating_map[hotel_id]
-                else:
-                    hotel["ratings"] = None  # rating not found
+                hotel["ratings"] = rating_map.get(hotel.get("hotelId"))  # None if rating not found
 
             return hotels
 
@@ -292,38 +500,61 @@ class travel_scraper:
 
 
 
-    def get_hotel_ratings(self, hotel_ids):
+    def get_hotel_ratings(self, hotel_ids, max_workers=HOTEL_RATINGS_MAX_WORKERS):
         """
-        Fetches hotel ratings for a list of hotel IDs in batches of 3.
+        Fetches hotel ratings for a list of hotel IDs.
+        Ratings are cached per hotel, so only hotels not rated recently are requested, in
+        batches of HOTEL_RATINGS_BATCH_SIZE (the endpoint maximum) running concurrently.
         Returns a list of rating data dictionaries.
         """
-        all_ratings = []
-        
         if not hotel_ids:
             return []
 
+        hotel_ids = list(dict.fromkeys(hotel_ids))
+        ratings = {}
+        missing = []
+        for hotel_id in hotel_ids:
+            cached = response_cache.get("hotel-sentiments", {"hotelId": hotel_id})
+            if cached is None:
+                missing.append(hotel_id)
+            else:
+                ratings[hotel_id] = cached
+
+        batches = [missing[i:i + HOTEL_RATINGS_BATCH_SIZE] for i in range(0, len(missing), HOTEL_RATINGS_BATCH_SIZE)]
+        if batches:
+            # The scheduler keeps the batches within the rate limit and behind flight searches
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as executor:
+                for batch_ratings in executor.map(self._fetch_rating_batch, batches):
+                    ratings.update(batch_ratings)
+
+        # Hotels without sentiment data are cached as {} so they aren't requested again
+        return [ratings[hotel_id] for hotel_id in hotel_ids if ratings.get(hotel_id)]
+
+    def _fetch_rating_batch(self, batch):
+        """
+        Requests the ratings of one batch of hotel IDs and caches them per hotel.
+        Returns {hotelId: rating} ({} for hotels without ratings), empty if the request failed.
+        """
         try:
-            # Batch the hotel IDs to avoid hitting API limits
-            batch_size = 3
-            for i in range(0, len(hotel_ids), batch_size):
-                batch = hotel_ids[i:i+batch_size]
-                hotel_ids_str = ",".join(batch)
-                
-                response = requests.get(
-                    "https://test.api.amadeus.com/v2/e-reputation/hotel-sentiments",
-                    headers={"Authorization": f"Bearer {self.token}"},
-                    params={"hotelIds": hotel_ids_str}
-                )
-                if response.status_code == 200:
-                    ratings = response.json().get("data", [])
-                    all_ratings.extend(ratings)
-                elif response.status_code == 429:
-                    print(f"[WARN] Rate limit exceeded, FREE QUOTA EXCEEDED")
-                else:
-                    print(f"[ERROR] Rating fetch failed for batch {batch}: {response.status_code} {response.reason}")
+            response = amadeus_scheduler.get(
+                "hotel-sentiments",
+                f"{AMADEUS_BASE_URL}/v2/e-reputation/hotel-sentiments",
+                priority=PRIORITY_BACKGROUND,
+                headers={"Authorization": f"Bearer {self.token}"},
+                params={"hotelIds": ",".join(batch)}
+            )
+            if response.status_code == 200:
+                found = {r["hotelId"]: r for r in response.json().get("data", []) if "hotelId" in r}
+                batch_ratings = {hotel_id: found.get(hotel_id, {}) for hotel_id in batch}
+                for hotel_id, rating in batch_ratings.items():
+                    response_cache.set("hotel-sentiments", {"hotelId": hotel_id}, rating)
+                return batch_ratings
+            elif response.status_code == 429:
+                # Still limited after the scheduler's retries
+                print(f"[WARN] Rate limit exceeded, FREE QUOTA EXCEEDED")
+            else:
+                print(f"[ERROR] Rating fetch failed for batch {batch}: {response.status_code} {response.reason}")
         except Exception as e:
             print(f"[ERROR] Unknown error during rating fetch: {e}")
 
-        return all_ratings
-
-
+        return {}
@@ -1,16 +1,23 @@
-import requests
-from src.config.config import OPENWEATHERMAP_API_KEY
+from src.api.http_client import http_client
+from src.config.config import OPENWEATHERMAP_API_KEY, OPENWEATHERMAP_BASE_URL
 
 class WeatherAPI:
     def __init__(self, api_key = OPENWEATHERMAP_API_KEY):
         self.api_key = api_key
-        self.base_url = "https://api.openweathermap.org/data/2.5/weather"
+        self.base_url = f"{OPENWEATHERMAP_BASE_URL}/data/2.5/weather"
 
     def get_weather(self, city_name):
+        return self._fetch({"q": city_name})
+
+    def get_weather_at(self, lat, lon, label=None):
+        """
+        Current weather at a coordinate (unambiguous, unlike city names shared by several places).
+        """
+        return self._fetch({"lat": lat, "lon": lon}, label)
+
+    def _fetch(self, params, label=None):
         try:
-            response = requests.get(
-                f"https://api.openweathermap.org/data/2.5/weather?q={city_name}&appid={self.api_key}"
-            )
+            response = http_client.get(self.base_url, params={**params, "appid": self.api_key})
             data = response.json()
 
             current = data["main"]
@@ -26,7 +33,7 @@ class WeatherAPI:
             icon_url = f"https://openweathermap.org/img/wn/{icon_code}@2x.png"
 
             return {
-                "city": data.get("name", city_name),
+                "city": label or data.get("name", params.get("q")),
                 "temp": round(temp_c, 1),
                 "feels_like": round(feels_like_c, 1),
                 "desc": desc.title(),
@@ -38,4 +45,3 @@ class WeatherAPI:
         except Exception as e:
             print(f"Weather fetch error: {e}")
             return None
-
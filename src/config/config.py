@@ -17,6 +17,12 @@ TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
 GOOGLE_TRENDS_REGION = os.getenv("GOOGLE_TRENDS_REGION", "TR")
 CALENDARIFIC_API_KEY = os.getenv("CALENDARIFIC_API_KEY")  # (optional, if using holiday API)
 
+# --- API ENDPOINTS ---
+# Overridable so the app and benchmarks can run against a local stub server
+AMADEUS_BASE_URL = os.getenv("AMADEUS_BASE_URL", "https://test.api.amadeus.com").rstrip("/")
+FRANKFURTER_BASE_URL = os.getenv("FRANKFURTER_BASE_URL", "https://api.frankfurter.app").rstrip("/")
+OPENWEATHERMAP_BASE_URL = os.getenv("OPENWEATHERMAP_BASE_URL", "https://api.openweathermap.org").rstrip("/")
+
 # --- PATHS ---
 # Get the project root directory (parent of src/)
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -27,12 +33,18 @@ MODEL_PATH = os.path.join(PROJECT_ROOT, "models") + os.sep
 RESULTS_PATH = os.path.join(PROJECT_ROOT, "results") + os.sep
 NOTEBOOK_PATH = os.path.join(PROJECT_ROOT, "notebooks") + os.sep
 LOG_PATH = os.path.join(PROJECT_ROOT, "logs") + os.sep
+CACHE_PATH = os.path.join(PROJECT_ROOT, "data", "cache") + os.sep
 SRC_PATH = os.path.join(PROJECT_ROOT, "src") + os.sep  
 IMG_PATH = os.path.join(PROJECT_ROOT, "images") + os.sep
 
 # --- MODEL PARAMETERS ---
 FORECAST_DAYS = 30
 
+# Fitted TravelForecaster models cached on disk (and LRU entries kept in memory)
+MODEL_CACHE_PATH = os.path.join(MODEL_PATH, "cache") + os.sep
+MODEL_CACHE_MAX_MEMORY = int(os.getenv("MODEL_CACHE_MAX_MEMORY", "32"))
+MODEL_CACHE_MAX_DISK = int(os.getenv("MODEL_CACHE_MAX_DISK", "256"))
+
 XGBOOST_PARAMS = {
     "learning_rate": 0.1,
     "max_depth": 5,
@@ -43,3 +55,103 @@ XGBOOST_PARAMS = {
 # --- OTHER SETTINGS ---
 IS_DEBUG = os.getenv("DEBUG_MODE", "false").lower() == "true"
 DEFAULT_CURRENCY = "TRY"
+
+# --- PERFORMANCE SETTINGS ---
+# Maximum number of concurrent upstream flight searches per date window (1 = sequential).
+# This only caps how many of a window's searches can wait in the Amadeus scheduler queue at once;
+# actual throughput is set by AMADEUS_MAX_TPS (paced at AMADEUS_RATE_SAFETY, one request at a time).
+FETCH_MAX_WORKERS = int(os.getenv("FETCH_MAX_WORKERS", "15"))
+
+# Exchange rates are refreshed at most once per base currency within this many seconds
+FX_RATES_TTL = int(os.getenv("FX_RATES_TTL", "3600"))
+
+# Shared HTTP client: per-host keep-alive pool size and default timeouts (seconds)
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+
+# Amadeus OAuth token: refresh this many seconds before expiry, optionally share it across
+# worker processes through a local file (disabled when unset)
+AMADEUS_TOKEN_REFRESH_MARGIN = int(os.getenv("AMADEUS_TOKEN_REFRESH_MARGIN", "60"))
+AMADEUS_TOKEN_CACHE_FILE = os.getenv("AMADEUS_TOKEN_CACHE_FILE")
+
+# Local fare history (every flight search result is appended here for model training)
+FARE_HISTORY_DB_PATH = os.getenv("FARE_HISTORY_DB_PATH", os.path.join(PROCESSED_DATA_PATH, "fare_history.sqlite"))
+RECORD_FARE_HISTORY = os.getenv("RECORD_FARE_HISTORY", "true").lower() == "true"
+
+# Upstream response cache shared by every process on the host ("memory", "sqlite" or "file")
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "sqlite")
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH", CACHE_PATH)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "20000"))
+RESPONSE_CACHE_DEFAULT_TTL = 900
+# Seconds each endpoint family's responses stay valid
+RESPONSE_CACHE_TTLS = {
+    "flight-offers": int(os.getenv("FLIGHT_OFFERS_CACHE_TTL", "2700")),
+    # Cached per hotel; sentiment scores change rarely
+    "hotel-sentiments": int(os.getenv("HOTEL_RATINGS_CACHE_TTL", str(7 * 24 * 3600))),
+    # Current weather per city coordinates
+    "weather": int(os.getenv("WEATHER_CACHE_TTL", "600")),
+    # Activities per destination coordinates and the hotel list per city code (ratings are cached per hotel)
+    "activities": int(os.getenv("ACTIVITIES_CACHE_TTL", "900")),
+    "hotels": int(os.getenv("HOTELS_CACHE_TTL", "900")),
+}
+
+# Parsed per-date flight offers kept in memory so overlapping date windows are stitched, not refetched
+OFFER_COLUMNS_CACHE_MAX_ENTRIES = int(os.getenv("OFFER_COLUMNS_CACHE_MAX_ENTRIES", "5000"))
+
+# Amadeus rate limits (requests per second). The test environment allows 10 per user across all
+# APIs; each endpoint family also gets its own share so rating lookups can't starve flight searches
+AMADEUS_MAX_TPS = float(os.getenv("AMADEUS_MAX_TPS", "10"))
+# ...and no more than one request every 100 ms, so requests are spaced out instead of sent in bursts
+AMADEUS_MAX_BURST = int(os.getenv("AMADEUS_MAX_BURST", "1"))
+# Requests are paced at this fraction of AMADEUS_MAX_TPS: network jitter bunches requests that
+# left evenly spaced, and pacing exactly at the limit still gets 429s
+AMADEUS_RATE_SAFETY = float(os.getenv("AMADEUS_RATE_SAFETY", "0.9"))
+AMADEUS_RATE_LIMITS = {
+    "flight-offers": float(os.getenv("AMADEUS_FLIGHT_OFFERS_TPS", "8")),
+    "auth": 2,
+    "locations": 2,
+    "activities": 2,
+    "hotels": 2,
+    "hotel-sentiments": 4,
+}
+AMADEUS_DEFAULT_RATE_LIMIT = 2
+# Rate limited (429) requests are retried after Retry-After, or with exponential backoff from this base
+AMADEUS_MAX_RETRIES = int(os.getenv("AMADEUS_MAX_RETRIES", "3"))
+AMADEUS_RETRY_BACKOFF = 1.0
+AMADEUS_MAX_BACKOFF = 30.0
+
+# Hotel ratings: the hotel-sentiments endpoint accepts at most 3 hotel IDs per request, so the
+# first HOTEL_RATINGS_MAX_HOTELS hotels of a city are rated with that many batches in flight at once
+HOTEL_RATINGS_BATCH_SIZE = 3
+HOTEL_RATINGS_MAX_HOTELS = int(os.getenv("HOTEL_RATINGS_MAX_HOTELS", "30"))
+HOTEL_RATINGS_MAX_WORKERS = int(os.getenv("HOTEL_RATINGS_MAX_WORKERS", "4"))
+
+# Weather service: concurrent lookups for bulk fetches, how long failed lookups are remembered,
+# and the airports whose weather is loaded ahead of the first visitor
+WEATHER_MAX_WORKERS = int(os.getenv("WEATHER_MAX_WORKERS", "8"))
+WEATHER_ERROR_TTL = 60
+WEATHER_PREWARM_AIRPORTS = os.getenv(
+    "WEATHER_PREWARM_AIRPORTS",
+    "IST,SAW,ESB,ADB,AYT,LHR,CDG,FRA,AMS,MAD,BCN,FCO,MUC,JFK,DXB"
+).split(",")
+
+# Boot-time warmup (see src/services/resources.py): load reference data in the background on the
+# first page run; WARMUP_NETWORK also prefetches the Amadeus token, exchange rates and weather
+WARMUP_ON_START = os.getenv("WARMUP_ON_START", "true").lower() == "true"
+WARMUP_NETWORK = os.getenv("WARMUP_NETWORK", "true").lower() == "true"
+
+# Deadline (seconds) for the parallel trip lookups (flights, weather, holidays, activities, hotels);
+# components still running when it expires are reported as timed out
+TRIP_BUNDLE_TIMEOUT = float(os.getenv("TRIP_BUNDLE_TIMEOUT", "60"))
+
+# --- METRICS ---
+# Upstream latency, cache and model fit metrics (src/utils/metrics.py). Off by default; when off,
+# instrumented code skips the timing entirely
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+# Prometheus text format on http://METRICS_HOST:METRICS_PORT/metrics (0 = no endpoint)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+# The same text is written to METRICS_DUMP_FILE every METRICS_DUMP_INTERVAL seconds (0 = never)
+METRICS_DUMP_INTERVAL = int(os.getenv("METRICS_DUMP_INTERVAL", "60"))
+METRICS_DUMP_FILE = os.path.join(LOG_PATH, "metrics.prom")
@@ -1,5 +1,5 @@
-import csv
 from src.config.config import RAW_DATA_PATH, PROCESSED_DATA_PATH
+from src.services.airport_registry import get_airport_registry
 
 class DataManager:
     def __init__(self, data_folder=RAW_DATA_PATH):
@@ -7,24 +7,14 @@ class DataManager:
         self.airports = []
 
     def load_airports(self, filename="airports.csv"):
+        # Served from the process-wide AirportRegistry, so the CSV is parsed once per process
         path = f"{self.data_folder}{filename}"
-        with open(path, encoding='utf-8') as f:
-            reader = csv.reader(f)
-            for row in reader:
-                name = row[1].strip()
-                city = row[2].strip()
-                iata = row[4].strip()
-
-                if iata and len(iata) == 3:
-                    if city:
-                        display_name = f"{city} - {name} ({iata})"
-                    else:
-                        display_name = f"{name} ({iata})"
-                    self.airports.append(display_name)
-
-        self.airports.sort()
+        self.airports = list(get_airport_registry(path).display_names)
         return self.airports
 
+    def get_airport_registry(self, filename="airports.csv"):
+        return get_airport_registry(f"{self.data_folder}{filename}")
+
 
     # for future use, if needed:
     # def get_flight_prices(...)
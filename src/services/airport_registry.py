@@ -0,0 +1,350 @@
+import csv
+import hashlib
+import os
+import tempfile
+import threading
+import zipfile
+from functools import cached_property, lru_cache
+from statistics import median
+import numpy as np
+from src.config.config import RAW_DATA_PATH, PROCESSED_DATA_PATH
+
+AIRPORTS_CSV_PATH = f"{RAW_DATA_PATH}airports.csv"
+AIRPORTS_SNAPSHOT_PATH = f"{PROCESSED_DATA_PATH}airports_snapshot.npz"
+
+# Bump when the snapshot layout changes so stale snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+
+# OpenFlights airports.csv column layout (the file has no header row)
+AIRPORT_COLUMNS = [
+    "id", "name", "city", "country", "iata_code", "icao_code",
+    "lat", "lon", "alt", "tz_offset", "dst", "tz", "type", "source"
+]
+
+_STRING_COLUMNS = ["iata", "name", "city", "country", "country_code", "display_name"]
+_SEPARATOR = "\x1f"
+
+# OpenFlights country names that pycountry doesn't know, or knows under a newer name
+COUNTRY_CODE_ALIASES = {
+    "Burma": "MM",
+    "Cape Verde": "CV",
+    "Congo (Brazzaville)": "CG",
+    "Congo (Kinshasa)": "CD",
+    "Cote d'Ivoire": "CI",
+    "East Timor": "TL",
+    "Johnston Atoll": "UM",
+    "Macau": "MO",
+    "Midway Islands": "UM",
+    "Reunion": "RE",
+    "Swaziland": "SZ",
+    "Turkey": "TR",
+    "Virgin Islands": "VI",
+    "Wake Island": "UM",
+}
+
+
+def _display_name(name, city, iata):
+    return f"{city} - {name} ({iata})" if city else f"{name} ({iata})"
+
+
+@lru_cache(maxsize=None)
+def resolve_country_code(country_name):
+    """
+    Resolves a country name to its ISO alpha-2 code ("XX" if unknown): known aliases first, then
+    pycountry by name, by any of its names and codes, and finally by partial name match.
+    """
+    # Only needed when the snapshot is rebuilt or for names outside the dataset
+    import pycountry
+
+    name = (country_name or "").strip()
+    if not name:
+        return "XX"
+    if name in COUNTRY_CODE_ALIASES:
+        return COUNTRY_CODE_ALIASES[name]
+
+    country = pycountry.countries.get(name=name)
+    if country:
+        return country.alpha_2
+    try:
+        return pycountry.countries.lookup(name).alpha_2
+    except LookupError:
+        pass
+    for c in pycountry.countries:
+        if name.lower() in c.name.lower():
+            return c.alpha_2
+    return "XX"
+
+
+def _file_fingerprint(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+class AirportRegistry:
+    """
+    In-memory airport catalog built once per process from airports.csv.
+    Only airports with a 3-letter IATA code are kept. Rows are sorted by display name
+    and stored column-wise, with O(1) indexes by IATA code, city and country.
+    """
+
+    def __init__(self, columns):
+        self.iata = columns["iata"]
+        self.name = columns["name"]
+        self.city = columns["city"]
+        self.country = columns["country"]
+        self.country_codes = columns["country_code"]
+        self.display_names = columns["display_name"]
+        self.lat = np.asarray(columns["lat"], dtype=np.float64)
+        self.lon = np.asarray(columns["lon"], dtype=np.float64)
+
+        self._by_iata = {code: i for i, code in enumerate(self.iata)}
+
+    # The secondary indexes are built on first use; building them twice under a race is harmless
+    @cached_property
+    def _by_display_name(self):
+        return {display: i for i, display in enumerate(self.display_names)}
+
+    @cached_property
+    def _by_city(self):
+        return self._group_by(self.city)
+
+    @cached_property
+    def _by_country(self):
+        return self._group_by(self.country)
+
+    @cached_property
+    def _country_codes(self):
+        return {country.lower(): code for country, code in zip(self.country, self.country_codes) if country}
+
+    @staticmethod
+    def _group_by(values):
+        index = {}
+        for i, value in enumerate(values):
+            if value:
+                index.setdefault(value.lower(), []).append(i)
+        return index
+
+    def __len__(self):
+        return len(self.iata)
+
+    # Building and snapshots
+    #-------------------------------------------------------------------
+    @classmethod
+    def from_csv(cls, path=AIRPORTS_CSV_PATH):
+        rows = []
+        with open(path, encoding="utf-8") as f:
+            for row in csv.reader(f):
+                name = row[1].strip()
+                city = row[2].strip()
+                iata = row[4].strip()
+                if not iata or len(iata) != 3:
+                    continue
+                try:
+                    lat, lon = float(row[6]), float(row[7])
+                except ValueError:
+                    lat, lon = np.nan, np.nan
+                rows.append((_display_name(name, city, iata), iata, name, city, row[3].strip(), lat, lon))
+
+        rows.sort()
+        display_names, iata, name, city, country, lat, lon = (list(col) for col in zip(*rows)) if rows else ([],) * 7
+        # Each distinct country name is resolved once here and stored with the snapshot
+        country_codes = {c: resolve_country_code(c) for c in set(country)}
+        return cls({
+            "display_name": display_names, "iata": iata, "name": name,
+            "city": city, "country": country, "country_code": [country_codes[c] for c in country],
+            "lat": lat, "lon": lon
+        })
+
+    def save_snapshot(self, path=AIRPORTS_SNAPSHOT_PATH, fingerprint=""):
+        """
+        Writes the registry as a compact .npz file: every string column is stored as one
+        separator-joined UTF-8 blob so loading is a single decode + split per column.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        arrays = {
+            column: np.frombuffer(_SEPARATOR.join(getattr(self, self._attr(column))).encode("utf-8"), dtype=np.uint8)
+            for column in _STRING_COLUMNS
+        }
+        # A unique temp file per writer, so processes rebuilding the snapshot at once can't interleave writes
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    version=np.array([SNAPSHOT_VERSION]),
+                    fingerprint=np.array([fingerprint]),
+                    lat=self.lat,
+                    lon=self.lon,
+                    **arrays
+                )
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def from_snapshot(cls, path=AIRPORTS_SNAPSHOT_PATH, fingerprint=None):
+        """
+        Loads a snapshot written by save_snapshot.
+        Returns None if it is missing, unreadable (e.g. truncated), from another snapshot version
+        or built from a different CSV.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"][0]) != SNAPSHOT_VERSION:
+                    return None
+                if fingerprint is not None and str(data["fingerprint"][0]) != fingerprint:
+                    return None
+                columns = {
+                    column: (data[column].tobytes().decode("utf-8").split(_SEPARATOR) if data[column].size else [])
+                    for column in _STRING_COLUMNS
+                }
+                columns["lat"] = data["lat"]
+                columns["lon"] = data["lon"]
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"[Airport Registry] Ignoring unreadable snapshot: {e}")
+            return None
+        return cls(columns)
+
+    @staticmethod
+    def _attr(column):
+        return {"display_name": "display_names", "country_code": "country_codes"}.get(column, column)
+
+    # Lookups
+    #-------------------------------------------------------------------
+    def _row(self, i):
+        return {
+            "iata": self.iata[i],
+            "name": self.name[i],
+            "city": self.city[i],
+            "country": self.country[i],
+            "country_code": self.country_codes[i],
+            "lat": float(self.lat[i]),
+            "lon": float(self.lon[i]),
+            "display_name": self.display_names[i],
+        }
+
+    def get(self, iata_code):
+        """
+        Returns the airport row for an IATA code, or None if it is unknown.
+        """
+        i = self._by_iata.get(iata_code.strip().upper()) if iata_code else None
+        return self._row(i) if i is not None else None
+
+    def get_by_display_name(self, display_name):
+        i = self._by_display_name.get(display_name)
+        return self._row(i) if i is not None else None
+
+    def by_city(self, city):
+        return [self._row(i) for i in self._by_city.get(city.strip().lower(), [])]
+
+    def by_country(self, country):
+        return [self._row(i) for i in self._by_country.get(country.strip().lower(), [])]
+
+    def country_of(self, iata_code):
+        i = self._by_iata.get(iata_code.strip().upper()) if iata_code else None
+        return self.country[i] if i is not None else None
+
+    def country_code_of(self, iata_code):
+        i = self._by_iata.get(iata_code.strip().upper()) if iata_code else None
+        return self.country_codes[i] if i is not None else None
+
+    def country_code(self, country_name):
+        """
+        Returns the ISO alpha-2 code of a country name used in the dataset ("XX" if it has none),
+        or None for names the dataset doesn't contain.
+        """
+        return self._country_codes.get(country_name.strip().lower()) if country_name else None
+
+    # Geocoding
+    #-------------------------------------------------------------------
+    @cached_property
+    def _city_coordinates(self):
+        """
+        (lat, lon) per (city, country) and per city name: the median position of the city's airports.
+        A city name used in several countries resolves to the country with the most airports there.
+        """
+        lat, lon = self.lat.tolist(), self.lon.tolist()
+        by_city_country, by_city = {}, {}
+        for city, indices in self._by_city.items():
+            groups = {}
+            for i in indices:
+                if lat[i] == lat[i] and lon[i] == lon[i]:  # skip NaN positions
+                    groups.setdefault(self.country[i].lower(), []).append(i)
+            for country, members in groups.items():
+                by_city_country[(city, country)] = (median(lat[i] for i in members), median(lon[i] for i in members))
+            if groups:
+                by_city[city] = by_city_country[(city, max(groups, key=lambda c: len(groups[c])))]
+        return by_city_country, by_city
+
+    def geocode(self, query):
+        """
+        Resolves an airport display name, city name or IATA code to the (lat, lon) of its city,
+        or None if the dataset doesn't know it.
+        """
+        if not query:
+            return None
+        by_city_country, by_city = self._city_coordinates
+
+        i = self._by_display_name.get(query)
+        if i is None:
+            coordinates = by_city.get(query.strip().lower())
+            if coordinates:
+                return coordinates
+            i = self._by_iata.get(query.strip().upper())
+        if i is None:
+            return None
+
+        coordinates = by_city_country.get((self.city[i].lower(), self.country[i].lower()))
+        if coordinates:
+            return coordinates
+        # Airports without a city name fall back to their own position
+        if np.isnan(self.lat[i]) or np.isnan(self.lon[i]):
+            return None
+        return float(self.lat[i]), float(self.lon[i])
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def load_airport_registry(csv_path=AIRPORTS_CSV_PATH, snapshot_path=AIRPORTS_SNAPSHOT_PATH):
+    """
+    Loads the registry from the on-disk snapshot, rebuilding (and rewriting) the snapshot
+    from the CSV when it is missing or was built from a different CSV.
+    """
+    fingerprint = _file_fingerprint(csv_path)
+    registry = AirportRegistry.from_snapshot(snapshot_path, fingerprint) if snapshot_path else None
+    if registry is None:
+        registry = AirportRegistry.from_csv(csv_path)
+        if snapshot_path:
+            try:
+                registry.save_snapshot(snapshot_path, fingerprint)
+            except OSError as e:
+                print(f"[Airport Registry] Could not write snapshot: {e}")
+    return registry
+
+
+def get_airport_registry(csv_path=AIRPORTS_CSV_PATH):
+    """
+    Returns the process-wide registry for an airports CSV, building it on first use.
+    """
+    registry = _registries.get(csv_path)
+    if registry is not None:
+        return registry
+
+    with _registries_lock:
+        registry = _registries.get(csv_path)
+        if registry is None:
+            snapshot_path = AIRPORTS_SNAPSHOT_PATH if csv_path == AIRPORTS_CSV_PATH else None
+            registry = _registries[csv_path] = load_airport_registry(csv_path, snapshot_path)
+        return registry
+
+
+if __name__ == "__main__":
+    # Rebuild the precompiled snapshot: python -m src.services.airport_registry
+    registry = AirportRegistry.from_csv(AIRPORTS_CSV_PATH)
+    registry.save_snapshot(AIRPORTS_SNAPSHOT_PATH, _file_fingerprint(AIRPORTS_CSV_PATH))
+    print(f"Wrote {len(registry)} airports to {AIRPORTS_SNAPSHOT_PATH}")
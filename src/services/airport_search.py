@@ -0,0 +1,135 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from functools import lru_cache
+from heapq import nsmallest
+from src.services.airport_registry import get_airport_registry
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Prefixes up to this length match so many tokens that their posting sets are precomputed
+_PRECOMPUTED_PREFIX_LENGTH = 2
+
+# Number of ranked results kept for each single-character query
+_PRECOMPUTED_RESULTS = 100
+
+
+def normalize_text(text):
+    """
+    Lowercases and strips accents, so "Atatürk" and "ataturk" compare equal.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    return _TOKEN_PATTERN.findall(normalize_text(text))
+
+
+class AirportSearchIndex:
+    """
+    Server-side autocomplete over the airport registry.
+    Every query token must be a prefix of an IATA code, city or airport name token,
+    in any order ("heath lon" finds London Heathrow). Results are ranked by exact IATA
+    match, IATA prefix, city prefix and name prefix, then alphabetically.
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self._iata = [code.lower() for code in registry.iata]
+        self._city = [normalize_text(city) for city in registry.city]
+        self._name = [normalize_text(name) for name in registry.name]
+
+        postings = {}
+        for i in range(len(registry)):
+            for token in {self._iata[i], *_TOKEN_PATTERN.findall(self._city[i]), *_TOKEN_PATTERN.findall(self._name[i])}:
+                postings.setdefault(token, set()).add(i)
+
+        self._tokens = sorted(postings)
+        self._postings = [frozenset(postings[token]) for token in self._tokens]
+
+        self._short_prefixes = {}
+        for token, rows in zip(self._tokens, self._postings):
+            for length in range(1, min(len(token), _PRECOMPUTED_PREFIX_LENGTH) + 1):
+                self._short_prefixes.setdefault(token[:length], set()).update(rows)
+
+        # Single-character queries match thousands of rows, so their ranking is done up front
+        self._single_char_results = {
+            prefix: tuple(nsmallest(_PRECOMPUTED_RESULTS, rows, key=lambda i, q=prefix: self._rank(i, q)))
+            for prefix, rows in self._short_prefixes.items() if len(prefix) == 1
+        }
+
+        # Repeated keystrokes (and reruns) hit the same queries over and over
+        self._cached_search = lru_cache(maxsize=2048)(self._search)
+
+    def _rows_for_prefix(self, prefix):
+        if len(prefix) <= _PRECOMPUTED_PREFIX_LENGTH:
+            return self._short_prefixes.get(prefix, set())
+
+        lo = bisect_left(self._tokens, prefix)
+        hi = bisect_left(self._tokens, prefix + "￿", lo)
+        if hi - lo == 1:
+            return self._postings[lo]
+        return set().union(*self._postings[lo:hi])
+
+    def _rank(self, i, query):
+        if self._iata[i] == query:
+            tier = 0
+        elif self._iata[i].startswith(query):
+            tier = 1
+        elif self._city[i].startswith(query):
+            tier = 2
+        elif self._name[i].startswith(query):
+            tier = 3
+        else:
+            tier = 4
+        # Rows are stored sorted by display name, so the row index breaks ties alphabetically
+        return tier, i
+
+    def _search(self, query, k):
+        tokens = _TOKEN_PATTERN.findall(query)
+        if not tokens:
+            return ()
+
+        if len(query) == 1 and k <= _PRECOMPUTED_RESULTS:
+            return tuple(self.registry.display_names[i] for i in self._single_char_results.get(query, ())[:k])
+
+        matches = [self._rows_for_prefix(token) for token in sorted(tokens, key=len, reverse=True)]
+        candidates = set(matches[0]).intersection(*matches[1:]) if len(matches) > 1 else matches[0]
+
+        if not candidates and len(matches) > 1:
+            # Tolerate a stray or misspelled word: fall back to rows matching the most query tokens
+            counts = {}
+            for rows in matches:
+                for i in rows:
+                    counts[i] = counts.get(i, 0) + 1
+            best = nsmallest(k, counts, key=lambda i: (-counts[i], self._rank(i, query)))
+            return tuple(self.registry.display_names[i] for i in best)
+
+        best = nsmallest(k, candidates, key=lambda i: self._rank(i, query))
+        return tuple(self.registry.display_names[i] for i in best)
+
+    def search(self, query, k=20):
+        """
+        Returns up to k airport display names matching the query, best match first.
+        """
+        if not query or k <= 0:
+            return []
+        return list(self._cached_search(" ".join(tokenize(query)), k))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_airport_search_index():
+    """
+    Returns the process-wide search index, building it from the airport registry on first use.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = AirportSearchIndex(get_airport_registry())
+    return _index
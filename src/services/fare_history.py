@@ -0,0 +1,195 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+import pandas as pd
+from src.config.config import FARE_HISTORY_DB_PATH
+
+# Column order of the fares table (and of the rows written by append/ingest)
+FARE_COLUMNS = [
+    "origin", "destination", "travel_class", "departure_date", "observed_at",
+    "adults", "price", "currency", "flight_type", "route", "departure_at",
+    "duration_minutes", "carriers", "flight_numbers"
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fares (
+    origin TEXT NOT NULL,
+    destination TEXT NOT NULL,
+    travel_class TEXT NOT NULL,
+    departure_date TEXT NOT NULL,
+    observed_at TEXT NOT NULL,
+    adults INTEGER,
+    price REAL,
+    currency TEXT,
+    flight_type TEXT,
+    route TEXT,
+    departure_at TEXT,
+    duration_minutes REAL,
+    carriers TEXT,
+    flight_numbers TEXT
+);
+DROP INDEX IF EXISTS idx_fares_route_date;
+CREATE INDEX IF NOT EXISTS idx_fares_route_adults_date
+    ON fares (origin, destination, travel_class, adults, currency, departure_date, observed_at);
+"""
+
+
+class FareHistoryStore:
+    """
+    Local append-only store of every flight search result (SQLite under PROCESSED_DATA_PATH).
+    Rows are indexed by (origin, destination, travel_class, adults, currency, departure_date, observed_at),
+    so route/date range scans stay fast as the history grows, and TravelForecaster can
+    train on more than the current 15-day snapshot.
+    Prices are per search (all adults) in the recorded currency, so comparable rows
+    share the same adults and currency.
+    """
+
+    def __init__(self, db_path=FARE_HISTORY_DB_PATH):
+        self.db_path = db_path
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialized:
+            # WAL lets readers (training, queries) run while a search result is being written
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    # Writing
+    #-------------------------------------------------------------------
+    @staticmethod
+    def _to_rows(df, travel_class=None, observed_at=None):
+        """
+        Converts a fetch_travel_data frame into tuples in FARE_COLUMNS order.
+        Columns are converted with numpy in one pass each rather than row by row.
+        """
+        n = len(df)
+
+        def constant(value):
+            return [value] * n
+
+        def text(column):
+            if column not in df.columns:
+                return constant(None)
+            values = df[column]
+            return values.astype(object).where(values.notna(), None).tolist()
+
+        def timestamps(values, unit):
+            # datetime64 -> ISO strings ("YYYY-MM-DD" / "YYYY-MM-DDTHH:MM:SS"), NaT -> None
+            converted = pd.to_datetime(values).to_numpy().astype(f"datetime64[{unit}]")
+            return [None if value == "NaT" else value for value in converted.astype(str).tolist()]
+
+        if "observed_at" in df.columns:
+            observed = timestamps(df["observed_at"], "s")
+        else:
+            observed = constant(pd.Timestamp(observed_at).strftime("%Y-%m-%dT%H:%M:%S"))
+
+        columns = [
+            text("origin"),
+            text("destination"),
+            text("travel_class") if "travel_class" in df.columns else constant(travel_class),
+            timestamps(df["date"], "D"),
+            observed,
+            df["adults"].astype("int64").tolist() if "adults" in df.columns else constant(1),
+            # NaN prices are stored as NULL by sqlite3
+            pd.to_numeric(df["price"], errors="coerce").astype("float64").tolist(),
+            text("currency"),
+            text("flight_type"),
+            text("route"),
+            timestamps(df["departure_at"], "s") if "departure_at" in df.columns else constant(None),
+            (pd.to_timedelta(df["duration"]).dt.total_seconds() / 60).tolist() if "duration" in df.columns else constant(None),
+            text("carriers"),
+            text("flight_numbers"),
+        ]
+        return zip(*columns)
+
+    def append(self, df, travel_class=None, observed_at=None):
+        """
+        Appends one search result in a single transaction.
+        travel_class/observed_at are used when the frame has no such column
+        (observed_at defaults to now). Returns the number of rows written.
+        """
+        if df is None or len(df) == 0:
+            return 0
+        observed_at = observed_at or datetime.now()
+        rows = self._to_rows(df, travel_class, observed_at)
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(f"INSERT INTO fares ({', '.join(FARE_COLUMNS)}) VALUES ({', '.join('?' * len(FARE_COLUMNS))})", rows)
+        return len(df)
+
+    def ingest(self, frames, travel_class=None):
+        """
+        Bulk-loads an iterable of frames (e.g. pd.read_csv(..., chunksize=100_000)),
+        one transaction per frame, so millions of rows never have to be in memory at once.
+        Returns the total number of rows written.
+        """
+        total = 0
+        with closing(self._connect()) as conn:
+            for df in frames:
+                if len(df) == 0:
+                    continue
+                with conn:
+                    conn.executemany(
+                        f"INSERT INTO fares ({', '.join(FARE_COLUMNS)}) VALUES ({', '.join('?' * len(FARE_COLUMNS))})",
+                        self._to_rows(df, travel_class, datetime.now())
+                    )
+                total += len(df)
+        return total
+
+    # Reading
+    #-------------------------------------------------------------------
+    @staticmethod
+    def _where(origin, destination, travel_class, start_date, end_date, observed_since, currency, adults):
+        clauses = ["origin = ?", "destination = ?", "travel_class = ?"]
+        params = [origin, destination, travel_class]
+        if adults is not None:
+            clauses.append("adults = ?")
+            params.append(int(adults))
+        if start_date is not None:
+            clauses.append("departure_date >= ?")
+            params.append(pd.to_datetime(start_date).strftime("%Y-%m-%d"))
+        if end_date is not None:
+            clauses.append("departure_date <= ?")
+            params.append(pd.to_datetime(end_date).strftime("%Y-%m-%d"))
+        if observed_since is not None:
+            clauses.append("observed_at >= ?")
+            params.append(pd.to_datetime(observed_since).strftime("%Y-%m-%dT%H:%M:%S"))
+        if currency is not None:
+            clauses.append("currency = ?")
+            params.append(currency)
+        return " AND ".join(clauses), params
+
+    def iter_query(self, origin, destination, travel_class, start_date=None, end_date=None, observed_since=None, currency=None, adults=None, chunksize=100_000):
+        """
+        Range scan over one route, yielding DataFrames of at most chunksize rows.
+        currency/adults filters are skipped when None.
+        The departure date is returned as 'date' so frames can go straight into TravelForecaster.preprocess.
+        """
+        where, params = self._where(origin, destination, travel_class, start_date, end_date, observed_since, currency, adults)
+        sql = (
+            "SELECT departure_date AS date, observed_at, origin, destination, travel_class, adults, price, currency, "
+            "flight_type, route, departure_at, duration_minutes, carriers, flight_numbers "
+            f"FROM fares WHERE {where} ORDER BY departure_date, observed_at"
+        )
+        with closing(self._connect()) as conn:
+            for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunksize, parse_dates=["date", "observed_at", "departure_at"]):
+                yield chunk
+
+    def query(self, origin, destination, travel_class, start_date=None, end_date=None, observed_since=None, currency=None, adults=None):
+        """
+        Same as iter_query, returned as a single DataFrame.
+        """
+        chunks = list(self.iter_query(origin, destination, travel_class, start_date, end_date, observed_since, currency, adults))
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+    def count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM fares").fetchone()[0]
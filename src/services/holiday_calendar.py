@@ -0,0 +1,89 @@
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+
+class HolidayCalendar:
+    """
+    Public holidays per country, built once per (country, year) and kept as sorted date lists,
+    so a date range query is two binary searches instead of a scan over the year's holidays.
+    Ranges may span several years.
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _as_date(value):
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
+
+    def _table(self, country_code, year):
+        key = (country_code, year)
+        table = self._tables.get(key)
+        if table is not None:
+            return table
+
+        # Imported on first use to keep the package off the page's import path
+        import holidays
+
+        try:
+            items = sorted(holidays.country_holidays(country_code, years=year).items())
+        except Exception as e:
+            # Countries the holidays package doesn't cover simply have none
+            print(f"[Holiday Calendar] No holidays for {country_code} {year}: {e}")
+            items = []
+        table = ([day for day, _ in items], [name for _, name in items])
+
+        with self._lock:
+            return self._tables.setdefault(key, table)
+
+    def between(self, country_code, start_date, end_date=None):
+        """
+        Returns the (date, name) holidays of a country from start_date to end_date (inclusive).
+        end_date defaults to start_date (a single day).
+        """
+        if not country_code or country_code == "XX":
+            return []
+        start = self._as_date(start_date)
+        end = self._as_date(end_date) if end_date is not None else start
+        if end < start:
+            return []
+
+        result = []
+        for year in range(start.year, end.year + 1):
+            dates, names = self._table(country_code, year)
+            lo, hi = bisect_left(dates, start), bisect_right(dates, end)
+            result.extend(zip(dates[lo:hi], names[lo:hi]))
+        return result
+
+    def warmup(self, country_codes, years=None):
+        """
+        Builds the tables for these countries ahead of the first query.
+        years defaults to the current and the next year. Returns the number of tables built.
+        """
+        if years is None:
+            this_year = date.today().year
+            years = (this_year, this_year + 1)
+
+        built = 0
+        for country_code in dict.fromkeys(country_codes):
+            if not country_code or country_code == "XX":
+                continue
+            for year in years:
+                if (country_code, year) not in self._tables:
+                    self._table(country_code, year)
+                    built += 1
+        return built
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+# Shared by every page and service in the process
+holiday_calendar = HolidayCalendar()
@@ -0,0 +1,113 @@
+import threading
+import time
+from src.config.config import AMADEUS_API_KEY, AMADEUS_API_SECRET, WARMUP_ON_START, WARMUP_NETWORK
+from src.utils.metrics import start_exporters
+
+# Services are imported when first needed so that importing this module stays cheap for pages
+# that only want to start the warmup
+
+_travel_service = None
+_travel_service_lock = threading.Lock()
+
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+_warmup_status = {}
+
+
+def get_travel_service():
+    """
+    Returns the process-wide TravelService, creating it on first use.
+    Every session and rerun shares it, together with its scraper, token manager and caches.
+    """
+    global _travel_service
+    if _travel_service is None:
+        with _travel_service_lock:
+            if _travel_service is None:
+                from src.services.travel_service import TravelService
+                _travel_service = TravelService()
+    return _travel_service
+
+
+def _warm_reference_data():
+    from src.services.airport_registry import get_airport_registry
+    from src.services.airport_search import get_airport_search_index
+    registry = get_airport_registry()
+    get_airport_search_index()
+    registry.geocode("IST")  # builds the lazy display-name and geocoding indexes
+    return len(registry)
+
+
+def _warm_holidays():
+    from src.utils.country_utils import warmup_holidays
+    return warmup_holidays()
+
+
+def _warm_token():
+    if not (AMADEUS_API_KEY and AMADEUS_API_SECRET):
+        return "skipped: no Amadeus credentials"
+    get_travel_service().scraper.get_access_token()
+    return "ok"
+
+
+def _warm_currency_rates():
+    from src.api.currency_rates import currency_rates
+    rates = currency_rates.get_rates("EUR")
+    return len(rates) if rates else "unavailable"
+
+
+def _warm_weather():
+    from src.services.weather_service import weather_service
+    return weather_service.prewarm()
+
+
+def _run_warmup(network):
+    steps = [("travel_service", lambda: type(get_travel_service()).__name__),
+             ("reference_data", _warm_reference_data),
+             ("holidays", _warm_holidays)]
+    if network:
+        steps += [("amadeus_token", _warm_token),
+                  ("currency_rates", _warm_currency_rates),
+                  ("weather", _warm_weather)]
+
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            result = {"result": step()}
+        except Exception as e:
+            print(f"[Warmup] {name} failed: {e}")
+            result = {"error": str(e)}
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        _warmup_status[name] = result
+
+    print("[Warmup] " + ", ".join(f"{name}: {status['seconds']}s" for name, status in _warmup_status.items()))
+
+
+def warmup(network=WARMUP_NETWORK, wait=False):
+    """
+    Loads reference data (airports, search index, holiday tables), prefetches the Amadeus token
+    and primes the exchange rate and weather caches, once per process.
+
+    Runs in a background thread so the page that triggers it renders immediately; pass wait=True
+    to block until it finishes. Later calls return the same thread. Returns None when disabled
+    with WARMUP_ON_START=false.
+
+    Also starts the metrics endpoint and dump (src/utils/metrics.py) when METRICS_ENABLED.
+    """
+    global _warmup_thread
+    start_exporters()
+    if not WARMUP_ON_START:
+        return None
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_run_warmup, args=(network,), name="valyzer-warmup", daemon=True)
+            _warmup_thread.start()
+    if wait:
+        _warmup_thread.join()
+    return _warmup_thread
+
+
+def warmup_status():
+    """
+    Returns {step: {"result" or "error", "seconds"}} for the warmup steps finished so far.
+    """
+    return dict(_warmup_status)
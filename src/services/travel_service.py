@@ -1,13 +1,27 @@
+import queue
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
 from src.services.DataManager import DataManager
+from src.services.airport_search import get_airport_search_index
+from src.services.fare_history import FareHistoryStore
+from src.services.weather_service import weather_service
 from src.api.travel_scraper import travel_scraper
-from src.api.weather_api import WeatherAPI
+from src.api.http_client import http_client
+from src.api.response_cache import response_cache
+from src.api.request_scheduler import amadeus_scheduler
+from src.config.config import FETCH_MAX_WORKERS, RECORD_FARE_HISTORY, TRIP_BUNDLE_TIMEOUT
+from src.utils.country_utils import extract_iata, get_holidays
 
 
 class TravelService:
     def __init__(self):
         self.repo = DataManager()
         self.scraper = travel_scraper()
-        self.weather_api = WeatherAPI()
+        self.weather_service = weather_service
+        self.fare_history = FareHistoryStore()
 
     def get_airports(self):
         """
@@ -15,36 +29,212 @@ class TravelService:
         """
         return self.repo.load_airports()
 
-    def get_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7):
+    def search_airports(self, query, k=20):
+        """
+        Returns up to k airport display names matching the typed text (IATA code, city or airport name).
+        """
+        return get_airport_search_index().search(query, k)
+
+    def get_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7, max_workers=FETCH_MAX_WORKERS):
         """
         Fetches travel data for the specified origin, destination, and travel date.
+        The per-date searches run concurrently with up to max_workers requests in flight.
         Returns a DataFrame with flight prices and details.
         """
-        result = self.scraper.fetch_travel_data(origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window)
+        fetched = {}
+        result = self.scraper.fetch_travel_data(origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window, max_workers,
+                                                on_fetched=fetched.__setitem__)
 
         # If an error is returned, return it directly to 2_Travel.py
         if isinstance(result, dict) and "error" in result:
             return result
 
+        if RECORD_FARE_HISTORY and fetched:
+            # Only dates that were searched upstream are new observations, stamped with their fetch time
+            observed_at = result["date"].dt.strftime("%Y-%m-%d").map(fetched)
+            self.record_fares(result.assign(observed_at=observed_at)[observed_at.notna()], classInfo)
+
         return result
+
+    def stream_travel_data(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window=7, max_workers=FETCH_MAX_WORKERS, deadline=None):
+        """
+        Streams travel data date by date as the searches complete.
+        Yields {"date", "data", "completed", "total", "fetched_at"} events, or a final
+        {"error", "status_code", ...} event if a search fails.
+        """
+        for event in self.scraper.iter_travel_data(origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window, max_workers, deadline):
+            # Cached dates were recorded when they were fetched
+            if RECORD_FARE_HISTORY and event.get("fetched_at") is not None:
+                self.record_fares(event["data"], classInfo, observed_at=event["fetched_at"])
+            yield event
+
+    def get_trip_bundle(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency,
+                        return_date=None, days_window=7, timeout=TRIP_BUNDLE_TIMEOUT, on_progress=None):
+        """
+        Runs every lookup of a trip concurrently under one deadline: the flight legs, origin and
+        destination weather, destination holidays, activities and hotels.
+
+        Returns {"results": {component: value}, "errors": {component: {"error", "status_code"}},
+        "timings": {component: seconds, "total": seconds}}. Components that fail or miss the
+        deadline are reported in "errors"; the others are still returned.
+
+        on_progress(component, event) is called in the caller's thread, so it may update the UI.
+        Flight legs report their streamed per-date events, and every component reports
+        {"done": True, "seconds": ...} when it finishes.
+        """
+        events = queue.Queue()
+        stop = threading.Event()
+        holiday_start = datetime.strptime(str(travel_date), "%Y-%m-%d").date()
+        holiday_end = datetime.strptime(str(return_date), "%Y-%m-%d").date() if return_date else None
+
+        # Flight searches still queued for a rate limit slot when the bundle times out are dropped
+        # instead of taking interactive slots from newer requests
+        request_deadline = time.monotonic() + timeout
+
+        def leg(name, leg_origin, leg_destination, leg_date):
+            report = lambda event: events.put(("progress", name, event))
+            return lambda: self._collect_travel_leg(
+                leg_origin, leg_destination, str(leg_date), classInfo, numOfAdults, selected_currency,
+                days_window, on_event=report, stop=stop, deadline=request_deadline
+            )
+
+        tasks = {"departure": leg("departure", origin, destination, travel_date)}
+        if return_date:
+            tasks["return"] = leg("return", destination, origin, return_date)
+        tasks.update({
+            "origin_weather": lambda: self.get_weather(origin),
+            "destination_weather": lambda: self.get_weather(destination),
+            "holidays": lambda: self.get_holidays(destination, holiday_start, holiday_end),
+            "activities": lambda: self.get_destination_activities(destination),
+            "hotels": lambda: self.get_hotels_by_city(destination),
+        })
+
+        results, errors, timings = {}, {}, {}
+        started = time.perf_counter()
+        deadline = started + timeout
+        executor = ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="trip-bundle")
+        try:
+            for name, task in tasks.items():
+                executor.submit(self._run_bundle_task, name, task, events)
+
+            pending = set(tasks)
+            while pending:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    kind, name, payload = events.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if kind == "progress":
+                    if on_progress:
+                        on_progress(name, payload)
+                    continue
+
+                value, seconds = payload
+                pending.discard(name)
+                timings[name] = seconds
+                if isinstance(value, dict) and "error" in value:
+                    errors[name] = value
+                else:
+                    results[name] = value
+                if on_progress:
+                    on_progress(name, {"done": True, "seconds": seconds})
+        finally:
+            # Don't wait for late components: flight legs stop at their next date, the rest finish
+            # in the background and still warm the caches
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        for name in pending:
+            errors[name] = {"error": f"Timed out after {timeout:g} seconds", "status_code": 504}
+            timings[name] = timeout
+        timings["total"] = time.perf_counter() - started
+
+        print("[Trip Bundle] " + ", ".join(f"{name}: {seconds:.2f}s" for name, seconds in timings.items()))
+        if errors:
+            print(f"[Trip Bundle] Failed components: {errors}")
+
+        return {"results": results, "errors": errors, "timings": timings}
+
+    @staticmethod
+    def _run_bundle_task(name, task, events):
+        started = time.perf_counter()
+        try:
+            value = task()
+        except Exception as e:
+            print(f"[Trip Bundle] {name} failed: {e}")
+            value = {"error": str(e), "status_code": 500}
+        events.put(("done", name, (value, time.perf_counter() - started)))
+
+    def _collect_travel_leg(self, origin, destination, travel_date, classInfo, numOfAdults, selected_currency,
+                            days_window=7, on_event=None, stop=None, deadline=None):
+        """
+        Consumes stream_travel_data for one flight leg and returns the whole window as a single
+        DataFrame sorted by date (or the error dict of the first failed search).
+        """
+        chunks = []
+        stream = self.stream_travel_data(origin, destination, travel_date, classInfo, numOfAdults, selected_currency, days_window, deadline=deadline)
+        try:
+            for event in stream:
+                if "error" in event:
+                    return {"error": event["error"], "status_code": event["status_code"]}
+                if not event["data"].empty:
+                    chunks.append(event["data"])
+                if on_event:
+                    on_event(event)
+                if stop is not None and stop.is_set():
+                    return {"error": "Cancelled", "status_code": 504}
+        finally:
+            stream.close()
+
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True).sort_values("date", kind="stable", ignore_index=True)
+
+    def record_fares(self, df, classInfo, observed_at=None):
+        """
+        Appends a search result to the local fare history. Failures are logged, never raised.
+        """
+        try:
+            self.fare_history.append(df, travel_class=classInfo, observed_at=observed_at)
+        except Exception as e:
+            print(f"[Fare History] Could not record fares: {e}")
     
-    def get_weather(self, city_name):
+    def get_weather(self, location):
         """
-        Fetches weather data for the specified city.
+        Fetches weather data for the specified airport (display name or IATA code) or city.
         Returns a dictionary with weather details.
         """
-        result = self.weather_api.get_weather(city_name)
+        result = self.weather_service.get_weather(location)
 
         # If an error is returned, return it directly to 2_Travel.py
         if result is None:
             return {"error": "Weather data not available", "status_code": 404}
 
         return result
-    
+
+    def get_weather_many(self, locations):
+        """
+        Fetches the weather of several airports or cities concurrently.
+        Returns {location: weather dict or error dict}.
+        """
+        return {
+            location: weather if weather is not None else {"error": "Weather data not available", "status_code": 404}
+            for location, weather in self.weather_service.get_weather_many(locations).items()
+        }
+
+    def get_holidays(self, airport, start_date, end_date=None):
+        """
+        Fetches the public holidays in the airport's country between start_date and end_date.
+        Returns a list of (date, name) tuples.
+        """
+        return get_holidays(start_date, extract_iata(airport), date_end=end_date)
 
     def get_destination_activities(self, destination):
         """
-        Fetches activities for the specified destination.
+        Fetches activities for the specified destination (airport display name, city name or IATA code).
         Returns a list of activities.
         """
 
@@ -69,5 +259,23 @@ class TravelService:
         
         return result
 
+    def get_connection_stats(self):
+        """
+        Returns per-host connection pool statistics of the shared HTTP client.
+        """
+        return http_client.pool_stats()
+
+    def get_cache_stats(self):
+        """
+        Returns hit/miss counters of the upstream response cache for this process.
+        """
+        return response_cache.stats()
+
+    def get_quota_stats(self):
+        """
+        Returns per-endpoint Amadeus request counters (this minute, this month, 429s, queueing).
+        """
+        return amadeus_scheduler.stats()
+
 
 # Future work: price prediction, filter etc.
\ No newline at end of file
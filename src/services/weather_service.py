@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from src.api.weather_api import WeatherAPI
+from src.api.response_cache import response_cache
+from src.services.airport_registry import get_airport_registry
+from src.config.config import WEATHER_MAX_WORKERS, WEATHER_ERROR_TTL, WEATHER_PREWARM_AIRPORTS
+
+
+class WeatherService:
+    """
+    Current weather for airports and cities, shared by every session through the response cache.
+
+    Locations (airport display names, IATA codes or city names) are resolved to city coordinates
+    from the airport catalog, so every airport of a city shares one cache entry and ambiguous
+    names such as "London" don't depend on OpenWeatherMap's guess. Places the catalog doesn't
+    know fall back to a lookup by name.
+    """
+
+    def __init__(self, weather_api=None, cache=response_cache):
+        self.weather_api = weather_api or WeatherAPI()
+        self.cache = cache
+
+    @staticmethod
+    def resolve(location):
+        """
+        Returns the cache key params and display label of a location.
+        """
+        registry = get_airport_registry()
+        airport = registry.get_by_display_name(location)
+        if airport is None and len(location.strip()) == 3 and not registry.by_city(location):
+            airport = registry.get(location)
+        label = (airport["city"] or airport["name"]) if airport else location.strip()
+
+        coordinates = registry.geocode(location)
+        if coordinates is None:
+            return {"q": label.lower()}, label
+        lat, lon = coordinates
+        # ~1 km grid, close enough for current conditions
+        return {"lat": round(lat, 2), "lon": round(lon, 2)}, label
+
+    def get_weather(self, location):
+        """
+        Returns the current weather dict for a location, or None if it is not available.
+        """
+        if not location or not location.strip():
+            return None
+        params, label = self.resolve(location)
+
+        cached = self.cache.get("weather", params)
+        if cached is None:
+            if "q" in params:
+                cached = self.weather_api.get_weather(label)
+            else:
+                cached = self.weather_api.get_weather_at(params["lat"], params["lon"], label)
+
+            if cached is None:
+                # Remember failures briefly so sidebar reruns don't retry on every interaction
+                self.cache.set("weather", params, {"error": "Weather data not available"}, ttl=WEATHER_ERROR_TTL)
+                return None
+            self.cache.set("weather", params, cached)
+
+        if "error" in cached:
+            return None
+        # Entries are shared by every airport of the city, the label is the caller's
+        return {**cached, "city": label}
+
+    def get_weather_many(self, locations, max_workers=WEATHER_MAX_WORKERS):
+        """
+        Fetches the weather of several locations concurrently.
+        Returns {location: weather dict or None}.
+        """
+        locations = list(dict.fromkeys(loc for loc in locations if loc))
+        if not locations:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(locations)))) as executor:
+            return dict(zip(locations, executor.map(self.get_weather, locations)))
+
+    def prewarm(self, locations=WEATHER_PREWARM_AIRPORTS, max_workers=WEATHER_MAX_WORKERS):
+        """
+        Loads the weather of popular airports into the shared cache.
+        Returns the number of locations with weather available.
+        """
+        results = self.get_weather_many(locations, max_workers)
+        return sum(1 for weather in results.values() if weather)
+
+
+# Shared by every page and service in the process
+weather_service = WeatherService()
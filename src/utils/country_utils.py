@@ -1,10 +1,12 @@
-import pycountry
 import re
-import pandas as pd
-import holidays
-from src.config.config import RAW_DATA_PATH
+from src.services.airport_registry import get_airport_registry, resolve_country_code
+from src.services.holiday_calendar import holiday_calendar
 
 def extract_iata(airport_str):
+        # Display names from the airport registry resolve with a dict lookup, anything else falls back to the regex
+        airport = get_airport_registry().get_by_display_name(airport_str)
+        if airport:
+            return airport["iata"]
         match = re.search(r'\((\w{3})\)', airport_str)
         return match.group(1) if match else airport_str
 
@@ -13,14 +15,12 @@ def country_name_to_code(country_name: str) -> str:
     Converts country name to 2-letter ISO country code (e.g., "Turkey" → "TR")
     """
     try:
-        country = pycountry.countries.get(name=country_name)
-        if not country:
-            # fallback: try partial match
-            for c in pycountry.countries:
-                if country_name.lower() in c.name.lower():
-                    return c.alpha_2
-            return "XX"
-        return country.alpha_2
+        # Every country of the airport dataset was resolved when its snapshot was built
+        code = get_airport_registry().country_code(country_name)
+        if code:
+            return code
+        # fallback for names outside the dataset: pycountry lookup + partial match (memoized)
+        return resolve_country_code(country_name)
     except Exception as e:
         print(f"[Country Code] Error: {e}")
         return "XX"
@@ -60,16 +60,9 @@ def get_country_code_from_iata(iata_code: str) -> str:
     Looks up the country code (ISO 2-letter) for a given IATA code.
     """
     try:
-        airports_data_path = f"{RAW_DATA_PATH}/airports.csv"
-        df = pd.read_csv(airports_data_path, header=None)
-        df.columns = [
-            "id", "name", "city", "country", "iata_code", "icao_code",
-            "lat", "lon", "alt", "tz_offset", "dst", "tz", "type", "source"
-        ]
-        row = df[df["iata_code"] == iata_code.upper()]
-        if not row.empty:
-            country_name = row.iloc[0]["country"]
-            return country_name_to_code(country_name)
+        country_code = get_airport_registry().country_code_of(iata_code)
+        if country_code:
+            return country_code
         else:
             raise ValueError(f"IATA code not found: {iata_code}")
     except Exception as e:
@@ -77,10 +70,11 @@ def get_country_code_from_iata(iata_code: str) -> str:
         return "XX"
 
 
-def get_holidays(date_start, iata_code, year, date_end=None):
+def get_holidays(date_start, iata_code, year=None, date_end=None):
     """
     Fetches holidays for the specified country and date range.
     Returns a list of holidays within the date range.
+    The range may cross a year boundary; year is no longer needed and kept for older callers.
     """
     try:
         country_code = get_country_code_from_iata(iata_code)
@@ -88,20 +82,17 @@ def get_holidays(date_start, iata_code, year, date_end=None):
             return []
 
         # Eğer date_end None ise, date_end = date_start yap (tek gün için)
-        if date_end is None:
-            date_end = date_start
-
-        # Initialize the holidays object for the specified country
-        country_holidays = holidays.CountryHoliday(country_code, years=year)
-
-        # Filter holidays within the specified date range
-        filtered_holidays = [
-            (date, name) for date, name in country_holidays.items()
-            if date_start <= date <= date_end
-        ]
-
-        return filtered_holidays
+        return holiday_calendar.between(country_code, date_start, date_end)
     except Exception as e:
         print(f"[Holiday Service] Error fetching holidays: {e}")
         return []
 
+
+def warmup_holidays(years=None):
+    """
+    Precomputes the holiday tables of every country in the airport catalog.
+    Returns the number of tables built.
+    """
+    registry = get_airport_registry()
+    country_codes = [country_name_to_code(country) for country in sorted(set(registry.country)) if country]
+    return holiday_calendar.warmup(country_codes, years)
@@ -0,0 +1,237 @@
+import atexit
+import functools
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from src.config.config import (
+    METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_DUMP_INTERVAL, METRICS_DUMP_FILE
+)
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Every metric the app records: name -> (type, help)
+METRICS = {
+    "valyzer_upstream_requests_total": ("counter", "Upstream HTTP responses by host, path and status code"),
+    "valyzer_upstream_errors_total": ("counter", "Upstream HTTP requests that got no response (timeouts, connection errors)"),
+    "valyzer_upstream_request_seconds": ("histogram", "Upstream HTTP request latency by host and path"),
+    "valyzer_amadeus_throttled_total": ("counter", "Amadeus 429 responses by endpoint family"),
+    "valyzer_amadeus_retries_total": ("counter", "Amadeus requests retried after a 429, by endpoint family"),
+    "valyzer_amadeus_queue_seconds": ("histogram", "Time Amadeus requests waited for a rate limit slot, by endpoint family"),
+    "valyzer_amadeus_token_refreshes_total": ("counter", "Amadeus OAuth tokens fetched"),
+    "valyzer_cache_operations_total": ("counter", "Cache lookups and writes by cache, endpoint and outcome"),
+    "valyzer_forecaster_seconds": ("histogram", "TravelForecaster preprocess, train and forecast durations"),
+}
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "started")
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Metrics:
+    """
+    In-process counters and latency histograms, exported in the Prometheus text format.
+
+    Disabled by default (METRICS_ENABLED): every recording method then returns right away, and hot
+    paths check `enabled` before doing any timing work of their own.
+    """
+
+    def __init__(self, enabled=METRICS_ENABLED, buckets=LATENCY_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> [per-bucket counts (+Inf last), sum, count]
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][bisect_left(self.buckets, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    def timer(self, name, **labels):
+        """
+        Context manager that observes the duration of its block in seconds.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return _Timer(self, name, labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # Export
+    #-------------------------------------------------------------------
+    @staticmethod
+    def _labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+        return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self):
+        """
+        Returns every recorded metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: [list(h[0]), h[1], h[2]] for key, h in self._histograms.items()}
+
+        samples = {}
+        for (name, labels), value in counters.items():
+            samples.setdefault(name, []).append(f"{name}{self._labels(labels)} {value:g}")
+        for (name, labels), (counts, total, count) in histograms.items():
+            lines = samples.setdefault(name, [])
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{self._labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {count}")
+
+        output = []
+        for name in sorted(samples):
+            kind, help_text = METRICS.get(name, ("untyped", name))
+            output.append(f"# HELP {name} {help_text}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(sorted(samples[name]) if kind != "histogram" else samples[name])
+        return "\n".join(output) + "\n"
+
+    def dump(self, path=METRICS_DUMP_FILE):
+        """
+        Writes the current metrics to path, replacing the previous snapshot atomically.
+        """
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+# Shared by every module in the process
+metrics = Metrics()
+
+
+def timed(name, **labels):
+    """
+    Decorator that observes the duration of every call in the named histogram.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - started, **labels)
+        return wrapper
+    return decorator
+
+
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def _serve(host, port):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="valyzer-metrics", daemon=True).start()
+    print(f"[Metrics] Serving http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def _dump(path):
+    try:
+        metrics.dump(path)
+    except Exception as e:
+        print(f"[Metrics] Could not write {path}: {e}")
+
+
+def _dump_periodically(interval, path):
+    while True:
+        time.sleep(interval)
+        _dump(path)
+
+
+def start_exporters(host=METRICS_HOST, port=METRICS_PORT, dump_interval=METRICS_DUMP_INTERVAL, dump_file=METRICS_DUMP_FILE):
+    """
+    Starts the /metrics endpoint (port 0 = none) and the periodic dump to dump_file
+    (dump_interval 0 = none), once per process. Does nothing while metrics are disabled.
+    """
+    global _exporters_started
+    if not metrics.enabled or _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+
+        if port:
+            try:
+                _serve(host, port)
+            except OSError as e:
+                # Usually another worker process already serves the port
+                print(f"[Metrics] Could not serve on {host}:{port}: {e}")
+
+        if dump_interval and dump_interval > 0:
+            threading.Thread(target=_dump_periodically, args=(dump_interval, dump_file),
+                             name="valyzer-metrics-dump", daemon=True).start()
+            atexit.register(_dump, dump_file)